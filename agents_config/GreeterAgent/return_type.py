@@ -1,4 +1,5 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 
 class GreetingResponse(BaseModel):
+    model_config = ConfigDict(defer_build=True)
     greeting_message: str = Field(description="The personalized greeting message.")
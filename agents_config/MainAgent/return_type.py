@@ -1,4 +1,5 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 
 class MainAgentResponse(BaseModel):
+    model_config = ConfigDict(defer_build=True)
     content: str = Field(description="Next agent answer.")
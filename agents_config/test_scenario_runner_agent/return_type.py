@@ -1,15 +1,6 @@
-from pydantic import BaseModel
-from typing import List
+from one_prompt_agents.plan_types import PlanReturnType
 
 
-class Steps(BaseModel):
-    plan_step: str
-    step_name: str
-    verified: bool
-    checked: bool
-
-class TestScenarioRunnerPlan(BaseModel):
-    plan: List[Steps]
-    plan_completion_percentage: float
+class TestScenarioRunnerPlan(PlanReturnType):
     testing_result: str
     testing_result_details: str
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List
 
 class JobTestResult(BaseModel):
@@ -6,5 +6,6 @@ class JobTestResult(BaseModel):
     The final output of the JobTestAgent, summarizing the results
     of the parallel echo jobs it waited for.
     """
+    model_config = ConfigDict(defer_build=True)
     final_summary: str
     echoed_results: List[str] 
\ No newline at end of file
@@ -1,16 +1,61 @@
 import json
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import tempfile
 import zipfile
 import os
-import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:  # optional speed-up, the stdlib json module is used otherwise
+    orjson = None
+
+MB = 1024 * 1024
+# Directories and files packaged as-is; paths inside the zip mirror these names
+PACKAGE_SOURCES = ("src", "scripts", "appspec.yml")
+PACKAGE_NAME = "deployment.zip"
+UPLOAD_CONCURRENCY = 16
+SSM_CONCURRENCY = 16
+# Packages below this size never touch the disk before being uploaded
+SPOOL_MAX_SIZE = 64 * MB
+
+# Shared by every AWS client; created once after authentication
+_session = None
+# Adaptive mode adds client-side rate limiting on top of exponential backoff with jitter,
+# so throttled S3/SSM/CodeDeploy calls are retried instead of aborting the deploy
+AWS_CLIENT_CONFIG = Config(
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    max_pool_connections=32,
+    tcp_keepalive=True
+)
+
+# Keep-alive HTTP session for the deployment service; retries transient gateway errors
+_http = requests.Session()
+_http.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(total=3, status_forcelist=[502, 503, 504], backoff_factor=0.3, allowed_methods=None)
+))
+
+def _json_loads(data):
+    """Parses JSON from bytes, using orjson when it is installed."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def _json_dumps(obj):
+    """Serializes `obj` to JSON bytes, using orjson when it is installed."""
+    return orjson.dumps(obj) if orjson else json.dumps(obj).encode("utf-8")
 
 def get_config():
     """Reads the configuration from config.json."""
     try:
-        with open("config.json", "r") as f:
-            return json.load(f)
+        with open("config.json", "rb") as f:
+            return _json_loads(f.read())
     except FileNotFoundError:
         print("Error: config.json not found. Please copy config.json.template and fill it out.")
         exit(1)
@@ -19,91 +64,110 @@ def get_credentials_and_settings(api_endpoint, api_key):
     """Fetches temporary credentials and settings from the auth API."""
     print("--> Authenticating with deployment service...")
     try:
-        response = requests.post(
+        response = _http.post(
             api_endpoint,
             headers={"Content-Type": "application/json"},
-            json={"api_key": api_key}
+            json={"api_key": api_key},
+            timeout=(5, 30)
         )
         response.raise_for_status()
         print("Authentication successful.")
-        return response.json()
+        return _json_loads(response.content)
     except requests.exceptions.RequestException as e:
         print(f"Error authenticating: {e}")
         print(f"Response body: {e.response.text if e.response else 'No response body'}")
         exit(1)
 
-def create_deployment_package(temp_dir, notification_email):
-    """Creates a zip file containing the application source and scripts."""
-    print("--> Creating deployment package...")
-    shutil.copytree("src", os.path.join(temp_dir, "src"))
-    shutil.copytree("scripts", os.path.join(temp_dir, "scripts"))
-    shutil.copy("appspec.yml", temp_dir)
-    
-    # Create deployment metadata file for notification script
-    meta_path = os.path.join(temp_dir, "deployment_meta.json")
-    with open(meta_path, "w") as f:
-        json.dump({"notification_email": notification_email}, f)
-    
-    zip_path = os.path.join(temp_dir, "deployment.zip")
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, _, files in os.walk(temp_dir):
-            for file in files:
-                if file != "deployment.zip":
-                    zipf.write(os.path.join(root, file), 
-                               os.path.relpath(os.path.join(root, file), temp_dir))
-    print("Deployment package created.")
-    return zip_path
-
-def upload_to_s3(creds, region, bucket, package_path):
-    """Uploads the deployment package to S3."""
-    print(f"--> Uploading package to s3://{bucket}...")
-    s3 = boto3.client(
-        's3',
+def init_aws_session(creds, region):
+    """Creates the boto3 session shared by all deploy steps from the temporary credentials."""
+    global _session
+    _session = boto3.session.Session(
         aws_access_key_id=creds['accessKeyId'],
         aws_secret_access_key=creds['secretAccessKey'],
         aws_session_token=creds['sessionToken'],
         region_name=region
     )
-    key = os.path.basename(package_path)
-    s3.upload_file(package_path, bucket, key)
+    _client.cache_clear()
+
+@lru_cache(maxsize=None)
+def _client(service):
+    """Returns a cached client for `service` built from the shared session."""
+    return _session.client(service, config=AWS_CLIENT_CONFIG)
+
+def _package_files():
+    """Lists the files to package, read directly from the source tree."""
+    files = []
+    for source in PACKAGE_SOURCES:
+        if os.path.isfile(source):
+            files.append(source)
+            continue
+        for root, _, names in os.walk(source):
+            files.extend(os.path.join(root, name) for name in names)
+    return files
+
+def create_deployment_package(notification_email):
+    """Creates a zip archive of the application source and scripts in a spooled temporary file."""
+    print("--> Creating deployment package...")
+    files = _package_files()
+    package = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+
+    with zipfile.ZipFile(package, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for path in files:
+            zipf.write(path)
+        # Deployment metadata for the notification script
+        zipf.writestr("deployment_meta.json", _json_dumps({"notification_email": notification_email}))
+    package.seek(0)
+    print("Deployment package created.")
+    return package
+
+def upload_to_s3(bucket, package):
+    """Uploads the deployment package to S3 using concurrent multipart transfers."""
+    print(f"--> Uploading package to s3://{bucket}...")
+    s3 = _client('s3')
+    transfer_config = TransferConfig(
+        multipart_threshold=8 * MB,
+        multipart_chunksize=16 * MB,
+        max_concurrency=UPLOAD_CONCURRENCY,
+        use_threads=True
+    )
+    key = PACKAGE_NAME
+    s3.upload_fileobj(package, bucket, key, Config=transfer_config)
     print("Upload successful.")
     return key
 
-def update_customer_parameters(creds, region, customer_name, parameters):
+def update_customer_parameters(customer_name, parameters):
     """Writes customer-defined parameters to SSM Parameter Store."""
     if not parameters:
         print("--> No parameters to update.")
         return
 
     print("--> Updating customer parameters in SSM Parameter Store...")
-    ssm = boto3.client(
-        'ssm',
-        aws_access_key_id=creds['accessKeyId'],
-        aws_secret_access_key=creds['secretAccessKey'],
-        aws_session_token=creds['sessionToken'],
-        region_name=region
-    )
-    for key, value in parameters.items():
-        param_name = f"/{customer_name}/app/{key}"
-        print(f"  - Setting parameter: {param_name}")
-        ssm.put_parameter(
-            Name=param_name,
-            Value=value,
-            Type='SecureString', # Use SecureString for all params for simplicity and security
-            Overwrite=True
-        )
+    ssm = _client('ssm')
+    # SSM has no batch put, so hide the per-call round-trip by issuing them concurrently
+    with ThreadPoolExecutor(max_workers=SSM_CONCURRENCY) as pool:
+        futures = {}
+        for key, value in parameters.items():
+            param_name = f"/{customer_name}/app/{key}"
+            print(f"  - Setting parameter: {param_name}")
+            futures[pool.submit(
+                ssm.put_parameter,
+                Name=param_name,
+                Value=value,
+                Type='SecureString', # Use SecureString for all params for simplicity and security
+                Overwrite=True
+            )] = param_name
+        for future in as_completed(futures):
+            if future.exception() is not None:
+                print(f"Error setting parameter {futures[future]}: {future.exception()}")
+                for pending in futures:
+                    pending.cancel()
+                raise future.exception()
     print("Parameter update successful.")
 
-def start_deployment(creds, region, app_name, dg_name, bucket, key):
+def start_deployment(app_name, dg_name, bucket, key):
     """Triggers a new CodeDeploy deployment."""
     print("--> Starting CodeDeploy deployment...")
-    codedeploy = boto3.client(
-        'codedeploy',
-        aws_access_key_id=creds['accessKeyId'],
-        aws_secret_access_key=creds['secretAccessKey'],
-        aws_session_token=creds['sessionToken'],
-        region_name=region
-    )
+    codedeploy = _client('codedeploy')
     response = codedeploy.create_deployment(
         applicationName=app_name,
         deploymentGroupName=dg_name,
@@ -132,15 +196,16 @@ def main():
         print("Error: Did not receive 'customer_name' from API. Cannot set parameters.")
         exit(1)
 
+    init_aws_session(creds, settings["aws_region"])
+
     # Update SSM parameters before deploying
     customer_params = config.get("parameters", {})
-    update_customer_parameters(creds, settings["aws_region"], customer_name, customer_params)
+    update_customer_parameters(customer_name, customer_params)
 
-    with tempfile.TemporaryDirectory() as temp_dir:
-        package_path = create_deployment_package(temp_dir, settings.get("notification_email"))
-        s3_key = upload_to_s3(creds, settings["aws_region"], settings["artefact_bucket"], package_path)
-        start_deployment(creds, settings["aws_region"], settings["codedeploy_app_name"], 
-                         settings["codedeploy_deployment_group"], settings["artefact_bucket"], s3_key)
+    with create_deployment_package(settings.get("notification_email")) as package:
+        s3_key = upload_to_s3(settings["artefact_bucket"], package)
+    start_deployment(settings["codedeploy_app_name"], settings["codedeploy_deployment_group"],
+                     settings["artefact_bucket"], s3_key)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
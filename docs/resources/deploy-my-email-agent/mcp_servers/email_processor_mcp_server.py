@@ -1,9 +1,10 @@
-import os, sys
+import os, sys, re
 from agents.mcp import MCPServerSse  # type: ignore
 from fastmcp import FastMCP  # type: ignore
 from types import MethodType
 from email import policy
-from email.parser import BytesParser
+from email.parser import BytesParser, BytesHeaderParser
+from email.iterators import typed_subpart_iterator
 from email.header import decode_header, make_header
 from html.parser import HTMLParser
 from pathlib import Path
@@ -31,8 +32,9 @@ mcp = FastMCP(
 @mcp.tool()
 def get_eml_email_subject(eml_path: str | Path) -> str:
     eml_path = Path(eml_path).expanduser().resolve(strict=True)
+    # Only the headers are needed; compat32 skips the default policy's header object parsing
     with eml_path.open("rb") as fp:
-        msg = BytesParser(policy=policy.default).parse(fp)
+        msg = BytesHeaderParser(policy=policy.compat32).parse(fp)
     raw_subj = msg["Subject"]
     if raw_subj is None:
         return ""
@@ -48,35 +50,65 @@ class _HTMLStripper(HTMLParser):
     def get_text(self) -> str:
         return "".join(self.parts).strip()
 
+# A plain start/end tag: a letter after "<" and no quotes, so the first ">" closes it
+_TAG_RE = re.compile(r"</?[A-Za-z][^<>\"']*>")
+_RAW_TEXT_TAGS = ("<script", "<style", "<textarea", "<title")
+
+def _html_to_text(html_parts: list[str]) -> str:
+    html = "\n".join(html_parts)
+    # Fast path: when every "<" starts a plain tag and there are no entities or raw-text
+    # elements, dropping the tags gives exactly what _HTMLStripper would return
+    if "&" not in html:
+        lowered = html.lower()
+        if not any(tag in lowered for tag in _RAW_TEXT_TAGS):
+            text, n_tags = _TAG_RE.subn("", html)
+            if n_tags == html.count("<"):
+                return text.strip()
+    stripper = _HTMLStripper()
+    stripper.feed(html)
+    stripper.close()
+    return stripper.get_text()
+
+def _iter_text_parts(msg, subtype: str):
+    """Yield decoded ``text/<subtype>`` parts that are not attachments; other parts are never decoded."""
+    for part in typed_subpart_iterator(msg, "text", subtype):
+        if part.get_content_disposition() == "attachment":
+            continue
+        yield part.get_content()
+
 @mcp.tool()
 def extract_email_body_from_eml(eml_path: str | Path, *, prefer_html: bool = False) -> str:
     eml_path = Path(eml_path).expanduser().resolve(strict=True)
     with eml_path.open("rb") as fp:
         msg = BytesParser(policy=policy.default).parse(fp)
-    plain_parts: list[str] = []
-    html_parts: list[str] = []
     if msg.get_content_maintype() == "text" and not msg.is_multipart():
         return msg.get_content()
-    for part in msg.walk():
-        ctype = part.get_content_type()
-        disp = part.get_content_disposition()
-        if disp == "attachment":
-            continue
-        if ctype == "text/plain":
-            plain_parts.append(part.get_content())
-        elif ctype == "text/html":
-            html_parts.append(part.get_content())
-    if plain_parts and not prefer_html:
-        return "\n\n".join(plain_parts).strip()
+    if not prefer_html:
+        plain_parts = list(_iter_text_parts(msg, "plain"))
+        if plain_parts:
+            return "\n\n".join(plain_parts).strip()
+    html_parts = list(_iter_text_parts(msg, "html"))
     if html_parts:
-        stripper = _HTMLStripper()
-        for html in html_parts:
-            stripper.feed(html)
-        return stripper.get_text()
+        return _html_to_text(html_parts)
     return ""
 
+def _install_uvloop():
+    # Only takes effect before an event loop exists, i.e. when the server runs standalone.
+    # When loaded by one-prompt-agents the host process owns the loop.
+    try:
+        import uvloop  # type: ignore
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+def _serve():
+    return mcp.run_sse_async(host="127.0.0.1", port=PORT, log_level="debug")
+
+# Called by one-prompt-agents while it sets up its (not yet running) loop; the task runs on that loop.
 def main():
     loop = asyncio.get_event_loop()
-    return loop.create_task(
-        mcp.run_sse_async(host="127.0.0.1", port=PORT, log_level="debug")
-    ) 
\ No newline at end of file
+    return loop.create_task(_serve())
+
+if __name__ == "__main__":
+    _install_uvloop()
+    asyncio.run(_serve())
@@ -1,4 +1,5 @@
-from pydantic import BaseModel  # type: ignore
+from pydantic import BaseModel, ConfigDict  # type: ignore
 
 class InteractiveAgentResponse(BaseModel):
+    model_config = ConfigDict(defer_build=True)
     content: str 
\ No newline at end of file
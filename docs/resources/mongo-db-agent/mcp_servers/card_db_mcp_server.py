@@ -1,15 +1,16 @@
 """
 MongoDB helper MCP server for card tracking.
-Requires `pymongo`.
+Requires `motor` (asyncio MongoDB driver, built on `pymongo`).
 """
 
 import os, sys, re, subprocess, asyncio
+from functools import lru_cache
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict
 
-from pymongo import MongoClient, ASCENDING, TEXT
-from pymongo.collection import Collection
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from pymongo import IndexModel, ASCENDING, TEXT
 from pymongo.errors import PyMongoError
 
 from fastmcp import FastMCP  # type: ignore
@@ -28,7 +29,8 @@ DB_NAME = "tcg"
 RETENTION_DAYS = 14
 PORT = 9003
 
-client = MongoClient(MONGO_URI, uuidRepresentation="standard")
+# Non-blocking driver: tool calls await Mongo instead of stalling the SSE event loop
+client = AsyncIOMotorClient(MONGO_URI, uuidRepresentation="standard")
 db = client[DB_NAME]
 
 # ─┐ MCP server
@@ -51,90 +53,116 @@ mcp = FastMCP(
 
 # ─┐ Helpers
 
-def _col(name: str) -> Collection:
+def _col(name: str) -> AsyncIOMotorCollection:
     return db[name]
 
 
-def _ensure_indexes() -> None:
-    cards = _col("cards")
-    offers = _col("offers")
-    cards.create_index([("name", TEXT), ("alt_names", TEXT)], default_language="none")
-    offers.create_index([("link", TEXT)], default_language="none")
-    cards.create_index([("name_lc", ASCENDING)], unique=True)
-    offers.create_index([("link", ASCENDING)], unique=True)
-    offers.create_index([("offer_id", ASCENDING)], unique=True)
-    expire = timedelta(days=RETENTION_DAYS)
-    cards.create_index("created_at", expireAfterSeconds=expire.total_seconds())
-    offers.create_index("created_at", expireAfterSeconds=expire.total_seconds())
-    cards.create_index([("psa_grade", ASCENDING)])
-
-_ensure_indexes()
+_EXPIRE_SECONDS = int(timedelta(days=RETENTION_DAYS).total_seconds())
+
+# Names match the ones MongoDB generates, so indexes created by earlier versions are recognised.
+_INDEXES: Dict[str, list[IndexModel]] = {
+    "cards": [
+        IndexModel([("name", TEXT), ("alt_names", TEXT)], name="name_text_alt_names_text", default_language="none"),
+        IndexModel([("name_lc", ASCENDING)], name="name_lc_1", unique=True),
+        IndexModel([("created_at", ASCENDING)], name="created_at_1", expireAfterSeconds=_EXPIRE_SECONDS),
+        IndexModel([("psa_grade", ASCENDING)], name="psa_grade_1"),
+    ],
+    "offers": [
+        IndexModel([("link", TEXT)], name="link_text", default_language="none"),
+        IndexModel([("link", ASCENDING)], name="link_1", unique=True),
+        IndexModel([("offer_id", ASCENDING)], name="offer_id_1", unique=True),
+        IndexModel([("created_at", ASCENDING)], name="created_at_1", expireAfterSeconds=_EXPIRE_SECONDS),
+    ],
+}
+
+async def _ensure_indexes() -> None:
+    # One listIndexes round-trip per collection; only missing indexes are created.
+    for name, wanted in _INDEXES.items():
+        col = _col(name)
+        existing = {idx["name"] async for idx in col.list_indexes()}
+        missing = [model for model in wanted if model.document["name"] not in existing]
+        if missing:
+            await col.create_indexes(missing)
 
 def _now() -> datetime:
     return datetime.utcnow()
 
+# Unicode-aware on purpose: card names contain accented characters (e.g. "Pokémon")
+_WORD = re.compile(r"\w+")
+
+@lru_cache(maxsize=1024)
 def _fts_query(q: str) -> str:
-    tokens = re.findall(r"\w+", q.lower())
-    return " ".join(tokens)
+    return " ".join(_WORD.findall(q.lower()))
 
 # ─┐ Tools
 
 @mcp.tool()
-def quick_search_cards(q: str, *, limit: int = 10) -> list[dict]:
-    cur = _col("cards").find(
-        {"$text": {"$search": _fts_query(q)}},
-        projection={"_id": False, "name": 1, "psa_grade": 1, "created_at": 1,
-                    "data": 1, "score": {"$meta": "textScore"}},
-    ).sort([("score", {"$meta": "textScore"})]).limit(limit)
-    hits = []
-    for doc in cur:
-        hits.append({
-            "name": doc["name"],
-            "psa_grade": doc.get("psa_grade"),
-            "created_at": doc["created_at"],
-            "data_keys": list(doc["data"].keys())
-        })
-    return hits
+async def quick_search_cards(q: str, *, limit: int = 10) -> list[dict]:
+    # Only the key names of `data` are returned, so the (possibly large) subdocument never leaves the server
+    cur = _col("cards").aggregate([
+        {"$match": {"$text": {"$search": _fts_query(q)}}},
+        {"$sort": {"score": {"$meta": "textScore"}}},
+        {"$limit": limit},
+        {"$project": {
+            "_id": 0, "name": 1, "psa_grade": 1, "created_at": 1,
+            "data_keys": {"$map": {
+                "input": {"$objectToArray": {"$ifNull": ["$data", {}]}},
+                "as": "kv",
+                "in": "$$kv.k",
+            }},
+        }},
+    ])
+    return await cur.to_list(length=None)
 
 @mcp.tool()
-def update_card(name: str, *, psa_grade: int = None, data: dict | None = None) -> str:
+async def update_card(name: str, *, psa_grade: int = None, data: dict | None = None) -> str:
     cards = _col("cards")
     name_lc = name.lower()
     now = _now()
     incoming = data.copy() if data else {}
     new_alt = incoming.pop("alt_names", [])
+    set_fields: Dict[str, Any] = {"name": name, "created_at": now}
+    set_on_insert: Dict[str, Any] = {}
+    if psa_grade is not None:
+        set_fields["psa_grade"] = psa_grade
+    else:
+        set_on_insert["psa_grade"] = None
+    # Merge incoming data keys server-side instead of reading and rewriting the whole subdocument
+    if incoming:
+        set_fields.update({f"data.{key}": value for key, value in incoming.items()})
+    else:
+        set_on_insert["data"] = {}
+    update: Dict[str, Any] = {
+        "$set": set_fields,
+        "$addToSet": {"alt_names": {"$each": list(new_alt)}},
+    }
+    if set_on_insert:
+        update["$setOnInsert"] = set_on_insert
     try:
-        cur = cards.find_one({"name_lc": name_lc})
-        if cur:
-            merged_data = cur.get("data", {}).copy()
-            if incoming:
-                merged_data.update(incoming)
-            merged_alt = list({*(cur.get("alt_names", [])), *new_alt})
-            upd = {
-                "name": name,
-                "created_at": now,
-                "data": merged_data,
-                "alt_names": merged_alt,
-            }
-            if psa_grade is not None:
-                upd["psa_grade"] = psa_grade
-            cards.update_one({"name_lc": name_lc}, {"$set": upd})
-        else:
-            payload = {
-                "name": name,
-                "name_lc": name_lc,
-                "psa_grade": psa_grade,
-                "alt_names": list(new_alt),
-                "data": incoming,
-                "created_at": now,
-            }
-            cards.insert_one(payload)
+        # Single atomic round-trip: updates an existing card or inserts a new one
+        # (name_lc is copied from the filter on insert)
+        await cards.update_one({"name_lc": name_lc}, update, upsert=True)
         return "success"
     except PyMongoError as exc:
         return f"error: {exc}"
 
 # run server
 
+async def _ensure_indexes_or_warn() -> None:
+    # Missing indexes only slow queries down, so an unreachable Mongo must not stop the server
+    try:
+        await _ensure_indexes()
+    except PyMongoError as exc:
+        print(f"⚠️  card-db-mcp: could not ensure indexes, serving without them: {exc!r}", file=sys.stderr)
+
+async def _serve():
+    # Indexes are checked alongside serving; Mongo's server selection can take a while to fail
+    indexes = asyncio.create_task(_ensure_indexes_or_warn())
+    try:
+        await mcp.run_sse_async(host="127.0.0.1", port=PORT, log_level="debug")
+    finally:
+        indexes.cancel()
+
 def main():
     loop = asyncio.get_event_loop()
-    return loop.create_task(mcp.run_sse_async(host="127.0.0.1", port=PORT, log_level="debug")) 
\ No newline at end of file
+    return loop.create_task(_serve()) 
\ No newline at end of file
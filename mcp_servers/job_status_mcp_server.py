@@ -2,6 +2,7 @@
 This MCP server is used to get the status of a job using its job_id.
 """
 
+import asyncio
 from fastmcp import FastMCP
 from agents.mcp import MCPServerSse
 from types import MethodType
@@ -85,19 +86,46 @@ def get_job_status(job_id: str):
         logger.error(f"Error calling get_job tool: {e}")
         return {"error": str(e)}
 
+def _install_uvloop():
+    """Use uvloop for the SSE server's event loop when it is installed.
+
+    Only takes effect before an event loop exists, i.e. when this server runs
+    standalone. When loaded by one-prompt-agents the host process owns the loop.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+def _serve():
+    """Returns the coroutine that runs this FastMCP SSE server."""
+    return mcp.run_sse_async( # This runs the mcp instance which implicitly uses job_status_processor_server
+        host='127.0.0.1',
+        port=PORT,
+        log_level='debug'
+    )
+
+async def _serve_standalone():
+    """Runs the server together with its client connection to the main MCP."""
+    await asyncio.gather(one_prompt_agent_mcp.connect(), _serve())
+
 def main():
-    import asyncio
+    """Schedules the server on the host's event loop.
+
+    Called by one-prompt-agents' `collect_servers` while the host is still setting
+    up its loop, so the task is created on that loop rather than run here.
+    """
     loop = asyncio.get_event_loop()
     # Ensure pro_reasoning_processor_server (or the relevant server object) is started
     # This task will run job_status_processor_server
-    task = loop.create_task(
-        mcp.run_sse_async( # This runs the mcp instance which implicitly uses job_status_processor_server
-            host='127.0.0.1',
-            port=PORT,
-            log_level='debug'
-        )
-    )
+    task = loop.create_task(_serve())
     # If you need to run other MCPs (like one_prompt_agent_mcp or pro_reasoning_mcp_server)
     # they should be started in their own processes or managed by a supervisor.
     # This main function only starts the job_status_mcp.
-    return task
\ No newline at end of file
+    return task
+
+# This allows running the server directly via 'python -m mcp_servers.job_status_mcp_server'
+if __name__ == '__main__':
+    _install_uvloop()
+    asyncio.run(_serve_standalone())
@@ -3,11 +3,17 @@ import os
 import json
 import uuid
 import logging
+from collections import deque
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, Field
 from fastmcp import FastMCP
 from agents.mcp import MCPServerSse
 
+try:
+    import orjson
+except ImportError:  # optional speed-up, the stdlib json module is used otherwise
+    orjson = None
+
 logger = logging.getLogger(__name__)
 PORT = 9001
 # Define the MCPSSE instance for this server
@@ -25,8 +31,16 @@ testing_mcp_server = MCPServerSse(
 # In-memory stores
 _test_scenarios_db: Dict[str, dict] = {}
 _test_results_db: Dict[str, dict] = {}
-_scenario_queue: List[str] = []
+_scenario_queue: deque[str] = deque()
+# Mirrors _scenario_queue for O(1) membership checks
+_scenario_queue_set: set[str] = set()
 _scenario_queue_lock = asyncio.Lock()
+# Set by the first disk scan so exhausted polls don't rescan the config tree every time
+_scenarios_loaded_once = False
+# Validated scenario dumps keyed by file path; entries are reused while (st_mtime_ns, st_size) is unchanged
+_scenario_file_cache: Dict[str, tuple[int, int, dict]] = {}
+# Upper bound on scenario files read concurrently, keeps file descriptor usage in check
+SCENARIO_LOAD_CONCURRENCY = 32
 
 mcp = FastMCP(
     name="TestingMCPServer",
@@ -64,8 +78,34 @@ def get_agents_config_path() -> str:
     config_path = os.path.abspath(os.path.join(here, "..", "agents_config"))
     return config_path
 
+def _json_loads(data: bytes) -> Any:
+    """Parses JSON from bytes, using orjson when it is installed."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def _json_dumps(obj: Any) -> str:
+    """Serializes `obj` to a JSON string, using orjson when it is installed."""
+    return orjson.dumps(obj).decode() if orjson else json.dumps(obj)
+
+def _load_scenario_cached(scenario_file_path: str) -> dict:
+    """Returns the validated scenario stored in a file as a dict, re-reading it only when it has changed."""
+    stat = os.stat(scenario_file_path)
+    cached = _scenario_file_cache.get(scenario_file_path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    with open(scenario_file_path, 'rb') as f:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either one
+        scenario_data = _json_loads(f.read())
+    if 'scenario_id' not in scenario_data:
+        scenario_data['scenario_id'] = str(uuid.uuid4())
+    # Validate once and keep the dump, so cache hits need no model round-trip
+    scenario = TestScenario.model_validate(scenario_data).model_dump()
+    _scenario_file_cache[scenario_file_path] = (stat.st_mtime_ns, stat.st_size, scenario)
+    return scenario
+
 @mcp.tool(name="load_scenarios_from_disk", description="Scans agent_config folders for test_* agents and loads their scenario JSON files.")
 async def load_scenarios_from_disk() -> dict:
+    global _scenarios_loaded_once
+    _scenarios_loaded_once = True
     agents_config_path = get_agents_config_path()
     loaded_scenarios_count = 0
     scenarios_found_for_loading = []
@@ -76,35 +116,47 @@ async def load_scenarios_from_disk() -> dict:
         logger.error(msg)
         return {"message": msg, "loaded_count": 0, "errors": [msg]}
 
-    for agent_folder_name in os.listdir(agents_config_path):
-        if agent_folder_name.startswith("test_"):
-            agent_folder_path = os.path.join(agents_config_path, agent_folder_name)
-            if os.path.isdir(agent_folder_path):
-                for item_name in os.listdir(agent_folder_path):
-                    if item_name.startswith("test_scenario_") and item_name.endswith(".json"):
-                        scenario_file_path = os.path.join(agent_folder_path, item_name)
-                        try:
-                            with open(scenario_file_path, 'r') as f:
-                                scenario_data = json.load(f)
-                                if 'scenario_id' not in scenario_data:
-                                    scenario_data['scenario_id'] = str(uuid.uuid4())
-                                scenario = TestScenario(**scenario_data)
-                                scenarios_found_for_loading.append(scenario)
-                                logger.info(f"Found scenario file: {scenario_file_path} for agent {agent_folder_name}")
-                        except json.JSONDecodeError as e:
-                            err_msg = f"Error decoding JSON from {scenario_file_path}: {e}"
-                            logger.error(err_msg)
-                            errors.append(err_msg)
-                        except Exception as e:
-                            err_msg = f"Error processing scenario file {scenario_file_path}: {e}"
-                            logger.error(err_msg)
-                            errors.append(err_msg)
+    # scandir entries carry the dirent type, so no extra stat is needed per entry
+    scenario_paths = []
+    with os.scandir(agents_config_path) as agent_entries:
+        for agent_entry in agent_entries:
+            if not (agent_entry.name.startswith("test_") and agent_entry.is_dir(follow_symlinks=False)):
+                continue
+            with os.scandir(agent_entry.path) as item_entries:
+                for item in item_entries:
+                    if item.name.startswith("test_scenario_") and item.name.endswith(".json"):
+                        scenario_paths.append(item.path)
+    # Sorted so the queue order does not depend on directory listing order
+    scenario_paths.sort()
+
+    # Read and validate the files off the event loop, overlapping their I/O
+    semaphore = asyncio.Semaphore(SCENARIO_LOAD_CONCURRENCY)
+    async def load_one(scenario_file_path: str) -> dict:
+        async with semaphore:
+            return await asyncio.to_thread(_load_scenario_cached, scenario_file_path)
+    results = await asyncio.gather(*(load_one(p) for p in scenario_paths), return_exceptions=True)
+
+    for scenario_file_path, result in zip(scenario_paths, results):
+        if isinstance(result, json.JSONDecodeError):
+            err_msg = f"Error decoding JSON from {scenario_file_path}: {result}"
+            logger.error(err_msg)
+            errors.append(err_msg)
+        elif isinstance(result, Exception):
+            err_msg = f"Error processing scenario file {scenario_file_path}: {result}"
+            logger.error(err_msg)
+            errors.append(err_msg)
+        else:
+            scenarios_found_for_loading.append(result)
+            agent_folder_name = os.path.basename(os.path.dirname(scenario_file_path))
+            logger.info(f"Found scenario file: {scenario_file_path} for agent {agent_folder_name}")
     loaded_ids = []
     for scenario in scenarios_found_for_loading:
-        _test_scenarios_db[scenario.scenario_id] = scenario.dict()
-        if scenario.scenario_id not in _test_results_db and scenario.scenario_id not in _scenario_queue:
-            _scenario_queue.append(scenario.scenario_id)
-        loaded_ids.append(scenario.scenario_id)
+        scenario_id = scenario['scenario_id']
+        _test_scenarios_db[scenario_id] = scenario
+        if scenario_id not in _test_results_db and scenario_id not in _scenario_queue_set:
+            _scenario_queue.append(scenario_id)
+            _scenario_queue_set.add(scenario_id)
+        loaded_ids.append(scenario_id)
     loaded_scenarios_count = len(loaded_ids)
     return {
         "message": f"Disk scan complete. Found and attempted to load {len(scenarios_found_for_loading)} scenarios. Successfully loaded: {loaded_scenarios_count}.",
@@ -116,19 +168,23 @@ async def load_scenarios_from_disk() -> dict:
 @mcp.tool(name="next_testing_scenario", description="Retrieves the next available test scenario from the queue. Returns status 'exhausted' if none remain.")
 async def next_testing_scenario() -> dict:
     async with _scenario_queue_lock:
-        if not _scenario_queue:
-            if not _test_scenarios_db:
-                logger.info("Scenario queue is empty and no scenarios in DB. Attempting to load from disk.")
-                await load_scenarios_from_disk()
-            if not _scenario_queue:
-                logger.info("Scenario queue is still empty after attempting disk load.")
-                return {"status": "exhausted"}
-        scenario_id = _scenario_queue.pop(0)
-        scenario = _test_scenarios_db.get(scenario_id)
-        if not scenario:
+        if not _scenario_queue and not _scenarios_loaded_once:
+            logger.info("Scenario queue is empty and scenarios were never loaded. Attempting to load from disk.")
+            await load_scenarios_from_disk()
+        # Loop rather than recurse: the lock is not reentrant
+        while _scenario_queue:
+            scenario_id = _scenario_queue.popleft()
+            _scenario_queue_set.discard(scenario_id)
+            scenario = _test_scenarios_db.get(scenario_id)
+            if scenario:
+                return {"status": "ok", "scenario": scenario}
             logger.warning(f"Scenario ID {scenario_id} was in queue but not found in DB. This shouldn't happen.")
-            return await next_testing_scenario()
-        return {"status": "ok", "scenario": scenario}
+        logger.info("Scenario queue is exhausted.")
+        return {"status": "exhausted"}
+
+def _dump_result(result: TestResult) -> dict:
+    """Dumps a result without its unset optional fields; None values inside metrics are kept."""
+    return result.model_dump(exclude={name for name, value in result if value is None})
 
 @mcp.tool(name="report_test_success", description="Reports a successful test scenario outcome.")
 async def report_test_success(scenario_id: str, details: str = "Test passed.", metrics: Optional[dict] = None) -> dict:
@@ -140,7 +196,7 @@ async def report_test_success(scenario_id: str, details: str = "Test passed.", m
         details=details,
         metrics=metrics
     )
-    _test_results_db[scenario_id] = result.dict()
+    _test_results_db[scenario_id] = _dump_result(result)
     logger.info(f"Test SUCCEEDED: {_test_scenarios_db[scenario_id]['name']} (ID: {scenario_id}). Details: {details}")
     return {"message": "Test success reported.", "scenario_id": scenario_id}
 
@@ -155,54 +211,59 @@ async def report_test_failure(scenario_id: str, what_failed: str, why: str, deta
         reason_for_failure=why,
         metrics=metrics
     )
-    _test_results_db[scenario_id] = result.dict()
+    _test_results_db[scenario_id] = _dump_result(result)
     logger.error(f"Test FAILED: {_test_scenarios_db[scenario_id]['name']} (ID: {scenario_id}). Reason: {why}. What failed: {what_failed}")
     return {"message": "Test failure reported.", "scenario_id": scenario_id}
 
 @mcp.tool(name="get_report", description="Retrieves a summary report of all executed test scenarios.")
 async def get_report() -> dict:
-    successful_count = 0
-    failed_count = 0
     all_results = list(_test_results_db.values())
-    for result in all_results:
-        if result["status"] == "SUCCESS":
-            successful_count += 1
-        elif result["status"] == "FAILURE":
-            failed_count += 1
-    report = TestReport(
-        total_scenarios_loaded=len(_test_scenarios_db),
-        total_scenarios_run=len(all_results),
-        successful=successful_count,
-        failed=failed_count,
-        results=[TestResult(**r) for r in all_results]
-    )
-    return report.dict()
+    successful_count = sum(1 for r in all_results if r["status"] == "SUCCESS")
+    failed_count = sum(1 for r in all_results if r["status"] == "FAILURE")
+    # Stored results are TestResult dumps validated when they were reported, so the
+    # report is assembled directly in the TestReport shape without a model round-trip
+    return {
+        "total_scenarios_loaded": len(_test_scenarios_db),
+        "total_scenarios_run": len(all_results),
+        "successful": successful_count,
+        "failed": failed_count,
+        "results": all_results
+    }
 
 @mcp.tool(name="send_report", description="Sends the test report (simulated - prints to console).")
 async def send_report(recipient_email: str, report_override: Optional[dict] = None) -> dict:
     report_to_send = report_override if report_override else await get_report()
-    report_str = f"Test Report for {recipient_email}:\n"
-    report_str += f"Total Scenarios Loaded: {report_to_send['total_scenarios_loaded']}\n"
-    report_str += f"Total Scenarios Run: {report_to_send['total_scenarios_run']}\n"
-    report_str += f"Successful: {report_to_send['successful']}\n"
-    report_str += f"Failed: {report_to_send['failed']}\n\n"
-    report_str += "Details of Run Scenarios:\n"
+    names = {sid: s.get('name', 'Unknown Scenario') for sid, s in _test_scenarios_db.items()}
+    parts: List[str] = [
+        f"Test Report for {recipient_email}:\n",
+        f"Total Scenarios Loaded: {report_to_send['total_scenarios_loaded']}\n",
+        f"Total Scenarios Run: {report_to_send['total_scenarios_run']}\n",
+        f"Successful: {report_to_send['successful']}\n",
+        f"Failed: {report_to_send['failed']}\n\n",
+        "Details of Run Scenarios:\n",
+    ]
     if not report_to_send['results']:
-        report_str += "  No scenarios have been run yet.\n"
+        parts.append("  No scenarios have been run yet.\n")
     for res in report_to_send['results']:
-        scenario_name = _test_scenarios_db.get(res['scenario_id'], {}).get('name', 'Unknown Scenario')
-        report_str += f"  Scenario: {scenario_name} (ID: {res['scenario_id']}) - Status: {res['status']}\n"
-        if res['status'] == "FAILURE":
-            report_str += f"    Reason: {res.get('reason_for_failure', '')}\n"
-            report_str += f"    Details: {res.get('details', '')}\n"
-        if res.get('metrics'):
-            report_str += f"    Metrics: {json.dumps(res['metrics'])}\n"
-        report_str += "\n"
-    print("---BEGIN SIMULATED EMAIL REPORT---")
-    print(f"To: {recipient_email}")
-    print("Subject: Automated Test Report")
-    print(report_str)
-    print("---END SIMULATED EMAIL REPORT---")
+        scenario_id = res['scenario_id']
+        status = res['status']
+        parts.append(f"  Scenario: {names.get(scenario_id, 'Unknown Scenario')} (ID: {scenario_id}) - Status: {status}\n")
+        if status == "FAILURE":
+            parts.append(f"    Reason: {res.get('reason_for_failure', '')}\n")
+            parts.append(f"    Details: {res.get('details', '')}\n")
+        metrics = res.get('metrics')
+        if metrics:
+            parts.append(f"    Metrics: {_json_dumps(metrics)}\n")
+        parts.append("\n")
+    report_str = "".join(parts)
+    # One write for the whole simulated email instead of one per line
+    print(
+        "---BEGIN SIMULATED EMAIL REPORT---\n"
+        f"To: {recipient_email}\n"
+        "Subject: Automated Test Report\n"
+        f"{report_str}\n"
+        "---END SIMULATED EMAIL REPORT---"
+    )
     logger.info(f"Simulated sending report to {recipient_email}")
     return {"message": f"Report (simulated) sent to {recipient_email}."}
 
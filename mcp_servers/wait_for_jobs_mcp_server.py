@@ -11,9 +11,9 @@ access to all the tools on the main MCP server.
 import asyncio
 import logging
 import os
-from types import MethodType
 from fastmcp import FastMCP
 from agents.mcp import MCPServerSse
+from one_prompt_agents.job_manager import DONE_JOBS
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -48,16 +48,55 @@ wait_for_jobs_proxy_server = MCPServerSse(
     name="wait_for_jobs_mcp_proxy", # The public name for this proxy server
 )
 
-# --- Connection Wrapper ---
-# Ensures the client to the main MCP is connected before this proxy server accepts connections.
-_original_connect = wait_for_jobs_proxy_server.connect
-async def _wrapped_connect(self, *args, **kwargs):
-    logger.info("Connecting to main MCP server before starting proxy...")
-    await one_prompt_agent_mcp.connect()
-    logger.info("Connection to main MCP successful. Starting proxy server connection...")
-    result = await _original_connect(*args, **kwargs)
-    return result
-wait_for_jobs_proxy_server.connect = MethodType(_wrapped_connect, wait_for_jobs_proxy_server)
+# --- Persistent connection to the main MCP ---
+# Pinged at half the SSE read timeout so the stream never idles out between tool calls
+KEEPALIVE_INTERVAL = one_prompt_agent_mcp.params["sse_read_timeout"] / 2
+RECONNECT_DELAY = 2       # seconds before the first reconnect attempt, doubled up to the max
+RECONNECT_MAX_DELAY = 60
+CONNECT_WAIT_TIMEOUT = 30  # how long a tool call waits for the connection to be up
+_main_connected = asyncio.Event()
+_connection_task: asyncio.Task | None = None
+
+async def _hold_main_connection():
+    """Owns the client connection to the main MCP: opens it, pings it, reopens it when a ping fails.
+
+    connect() and cleanup() enter and exit anyio cancel scopes, so they must run in the same
+    task; this task is the only place either is called.
+    """
+    delay = RECONNECT_DELAY
+    while True:
+        try:
+            logger.info("Connecting to main MCP server...")
+            await one_prompt_agent_mcp.connect()
+        except Exception as e:
+            logger.error(f"Connecting to main MCP failed, retrying in {delay}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+            continue
+        logger.info("Connection to main MCP successful.")
+        delay = RECONNECT_DELAY
+        _main_connected.set()
+        try:
+            while True:
+                await asyncio.sleep(KEEPALIVE_INTERVAL)
+                await one_prompt_agent_mcp.session.send_ping()
+        except Exception as e:
+            logger.warning(f"Main MCP keep-alive ping failed, reconnecting: {e}")
+        finally:
+            # Also runs on cancellation, so the connection is closed by the task that opened it
+            _main_connected.clear()
+            await one_prompt_agent_mcp.cleanup()
+
+async def _ensure_main_connection():
+    """Starts the connection task once and waits until the main MCP connection is up."""
+    global _connection_task
+    if _connection_task is None or _connection_task.done():
+        _connection_task = asyncio.create_task(_hold_main_connection())
+    await asyncio.wait_for(_main_connected.wait(), timeout=CONNECT_WAIT_TIMEOUT)
+
+def _all_jobs_done(job_ids: list) -> bool:
+    """Checks the in-process job registry (when the proxy runs inside the main app) for completed jobs."""
+    return DONE_JOBS.issuperset(job_ids)
 
 # --- FastMCP Instance for this Proxy ---
 mcp = FastMCP(
@@ -67,14 +106,20 @@ mcp = FastMCP(
 )
 
 @mcp.tool()
-def wait_for_jobs(your_job_id: str, job_ids_to_wait_for: list):
+async def wait_for_jobs(your_job_id: str, job_ids_to_wait_for: list):
     """
     Pauses the calling agent's job and waits for a list of other jobs to complete.
     This is a proxy tool that calls the main system's 'wait_for_jobs' function.
     """
+    if not job_ids_to_wait_for:
+        return {"error": "job_ids_to_wait_for must list at least one job id."}
+    if _all_jobs_done(job_ids_to_wait_for):
+        # Nothing to wait for, skip the round-trip to the main MCP
+        return f"Jobs {', '.join(job_ids_to_wait_for)} have already completed. Your job ({your_job_id}) can continue."
     try:
         logger.info(f"Proxying 'wait_for_jobs' call for job {your_job_id}, waiting for {job_ids_to_wait_for}")
-        return one_prompt_agent_mcp.call_tool(
+        await _ensure_main_connection()
+        return await one_prompt_agent_mcp.call_tool(
             "wait_for_jobs",
             {"your_job_id": your_job_id, "job_ids_to_wait_for": job_ids_to_wait_for},
         )
@@ -1,9 +1,11 @@
 # Usage:
-# configs = discover_configs(Path("agents"))
+# configs = discover_configs(Path("agents_config"))
 # load_order = topo_sort(configs)
-import json, importlib, sys
+import json, importlib, hashlib, sys
 from pathlib import Path
-from typing import Dict, List, Set, Any
+from types import ModuleType
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Iterator, Tuple
 from collections import defaultdict
 from pydantic import BaseModel, PrivateAttr, create_model
 from one_prompt_agents.mcp_agent import MCPAgent
@@ -11,6 +13,16 @@ from one_prompt_agents.mcp_agent import MCPAgent
 import logging
 logger = logging.getLogger(__name__) 
 
+# DFS node states used by topo_sort
+WHITE, GRAY, BLACK = 0, 1, 2
+
+# discover_configs results keyed by agents_dir; reused while the config files fingerprint is unchanged
+_discover_cache: Dict[Path, Tuple[tuple, Dict[str, "AgentConfig"]]] = {}
+# topo_sort results keyed by the dependency signature of the configs
+_load_order_cache: Dict[tuple, List[str]] = {}
+# Modules imported by import_module_from_path keyed by (path, mtime_ns)
+_module_cache: Dict[Tuple[str, int], ModuleType] = {}
+
 class AgentConfig(BaseModel):
     """Represents the configuration for an agent, loaded from a config.json file.
 
@@ -51,16 +63,30 @@ def discover_configs(agents_dir: Path) -> Dict[str, AgentConfig]:
     Returns:
         Dict[str, AgentConfig]: A dictionary mapping agent names to their configurations.
     """
-    configs = {}
+    # One stat per config file; adding, removing or editing any of them changes the fingerprint
+    cfg_stats = []
     for folder in agents_dir.iterdir():
         cfg_path = folder / "config.json"
-        if cfg_path.exists():
-            data = json.loads(cfg_path.read_text())
+        try:
+            st = cfg_path.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        cfg_stats.append((folder.name, st.st_mtime_ns, st.st_size))
+    fingerprint = tuple(sorted(cfg_stats))
+
+    cached = _discover_cache.get(agents_dir)
+    if cached is None or cached[0] != fingerprint:
+        configs = {}
+        for folder_name, _, _ in fingerprint:
+            data = json.loads((agents_dir / folder_name / "config.json").read_bytes())
             if "strategy_name" not in data:
                 data["strategy_name"] = "default"
             configs[data["name"]] = AgentConfig(**data)
-            configs[data["name"]]._path = folder.name
-    return configs
+            configs[data["name"]]._path = folder_name
+        cached = (fingerprint, configs)
+        _discover_cache[agents_dir] = cached
+    # Callers mutate configs (e.g. wildcard tool expansion), so hand out copies
+    return {name: cfg.model_copy() for name, cfg in cached[1].items()}
 
 def topo_sort(configs: Dict[str, AgentConfig]) -> List[str]:
     """Performs a topological sort on agent configurations based on their tool dependencies.
@@ -77,6 +103,11 @@ def topo_sort(configs: Dict[str, AgentConfig]) -> List[str]:
     Raises:
         ValueError: If a cyclic dependency between agents is detected.
     """
+    # The order only depends on agent names and tool lists, so unchanged configs reuse it
+    signature = tuple((name, tuple(cfg.tools)) for name, cfg in configs.items())
+    cached = _load_order_cache.get(signature)
+    if cached is not None:
+        return list(cached)
     graph = defaultdict(list)
     wildcard_agents = []
     for name, cfg in configs.items():
@@ -86,23 +117,32 @@ def topo_sort(configs: Dict[str, AgentConfig]) -> List[str]:
         for dep in cfg.tools:
             if dep in configs:
                 graph[dep].append(name)
-    visited, temp, order = set(), set(), []
-    def dfs(node):
-        if node in temp:
-            raise ValueError(f"Cyclic dependency at {node}")
-        if node not in visited:
-            temp.add(node)
-            for nei in graph[node]:
-                dfs(nei)
-            temp.remove(node); visited.add(node); order.append(node)
-    for node in configs:
-        if node not in wildcard_agents:
-            dfs(node)
+    # Iterative DFS with an explicit stack, so deep dependency chains don't hit the recursion limit
+    color = {name: WHITE for name in configs}
+    order = []
+    for root in configs:
+        if root in wildcard_agents or color[root] != WHITE:
+            continue
+        color[root] = GRAY
+        stack: List[Tuple[str, Iterator[str]]] = [(root, iter(graph[root]))]
+        while stack:
+            node, neighbours = stack[-1]
+            nei = next(neighbours, None)
+            if nei is None:
+                stack.pop()
+                color[node] = BLACK
+                order.append(node)
+            elif color[nei] == GRAY:
+                raise ValueError(f"Cyclic dependency at {nei}")
+            elif color[nei] == WHITE:
+                color[nei] = GRAY
+                stack.append((nei, iter(graph[nei])))
     order.reverse()  # reverse to get the correct order
     logger.info(f"Load order (pre-wildcard): {order}")
     # Add wildcard agents at the end
     order += wildcard_agents
     logger.info(f"Final load order (wildcard last): {order}")
+    _load_order_cache[signature] = list(order)
     return order  # dependencies first, wildcard agents last
 
 def import_module_from_path(path: Path):
@@ -114,15 +154,36 @@ def import_module_from_path(path: Path):
     Args:
         path (Path): The path to the Python file to import.
 
+    Modules are cached by path and modification time, so an unchanged file is
+    only executed once; a cache hit leaves `sys.modules` untouched. Every agent's
+    file is called `return_type.py`, so each one is registered under a name derived
+    from its resolved path instead of the bare stem, which keeps concurrent imports
+    of different agents from replacing each other's entry.
+
     Returns:
         module: The imported module object.
     """
-    spec = importlib.util.spec_from_file_location(path.stem, path)
+    key = (str(path), path.stat().st_mtime_ns)
+    module = _module_cache.get(key)
+    if module is not None:
+        return module
+    digest = hashlib.sha1(str(path.resolve()).encode()).hexdigest()[:12]
+    spec = importlib.util.spec_from_file_location(f"{path.stem}_{digest}", path)
     module = importlib.util.module_from_spec(spec)
     sys.modules[spec.name] = module        # supports intra-module imports
     spec.loader.exec_module(module)        # run the code
+    _module_cache[key] = module
     return module
 
+_IMPORT_ERRORS = (AttributeError, FileNotFoundError, ImportError, SyntaxError)
+
+def _import_return_type_module(path: Path):
+    """Imports a `return_type.py`, returning the expected import errors instead of raising them."""
+    try:
+        return import_module_from_path(path)
+    except _IMPORT_ERRORS as e:
+        return e
+
 def load_agents(configs, load_order, static_servers, job_queue):
     """Loads and initializes all agents based on their configurations and load order.
 
@@ -142,7 +203,23 @@ def load_agents(configs, load_order, static_servers, job_queue):
     Returns:
         Dict[str, MCPAgent]: A dictionary mapping agent names to their loaded `MCPAgent` instances.
     """
+    # Return type modules don't depend on each other, so import them all up front on a
+    # thread pool; the ordered loop below then only builds the agents.
+    return_type_files = {}
+    for name in load_order:
+        cfg = configs[name]
+        return_type_file = Path("agents_config") / cfg._path / "return_type.py"
+        if cfg.return_type is not None and return_type_file.exists():
+            return_type_files[name] = return_type_file
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        return_type_modules = dict(zip(
+            return_type_files,
+            pool.map(_import_return_type_module, return_type_files.values())
+        ))
+
     loaded = {}
+    # Static servers and agents loaded so far, resolved with a single lookup per tool
+    registry = dict(static_servers)
     for name in load_order:
         cfg = configs[name]
         folder = Path("agents_config") / cfg._path
@@ -158,11 +235,13 @@ def load_agents(configs, load_order, static_servers, job_queue):
 
         if cfg.return_type is not None:
             return_type_file = folder / "return_type.py"
-            if return_type_file.exists():
+            if name in return_type_modules:
                 try:
-                    mod = import_module_from_path(return_type_file)
+                    mod = return_type_modules[name]
+                    if isinstance(mod, Exception):
+                        raise mod
                     ReturnType = getattr(mod, cfg.return_type)
-                except (AttributeError, FileNotFoundError, ImportError, SyntaxError) as e:
+                except _IMPORT_ERRORS as e:
                     logger.warning(
                         f"Agent '{cfg.name}': Could not import return type '{cfg.return_type}' "
                         f"from {return_type_file}. Falling back to empty model. Error: {e}"
@@ -184,12 +263,7 @@ def load_agents(configs, load_order, static_servers, job_queue):
             cfg.tools = all_tools
 
         # resolve tool list: either static or other agents
-        tools = []
-        for t in cfg.tools:
-            if t in static_servers:
-                tools.append(static_servers[t])
-            else:
-                tools.append(loaded[t])
+        tools = [registry[t] for t in cfg.tools]
 
         mcp_agent = MCPAgent(
             name           = cfg.name,
@@ -203,4 +277,5 @@ def load_agents(configs, load_order, static_servers, job_queue):
             tools_config = cfg.tools_config if hasattr(cfg, 'tools_config') else None
         )
         loaded[name] = mcp_agent
+        registry.setdefault(name, mcp_agent)  # static servers keep precedence on name clashes
     return loaded
@@ -7,12 +7,19 @@ the HTTP API endpoints (like health checks and agent run triggers).
 It relies on the main CLI module to populate its agent registry.
 """
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel
 from one_prompt_agents.mcp_agent import start_agent
 import logging
 import os
 import asyncio
 
+try:
+    import orjson  # noqa: F401  (required by ORJSONResponse)
+    FastJSONResponse = ORJSONResponse
+except ImportError:  # optional speed-up, the stdlib json module is used otherwise
+    FastJSONResponse = JSONResponse
+
 logger = logging.getLogger(__name__)
 
 # Will be populated after agent loading, imported from cli.py or a shared state module if needed
@@ -20,7 +27,7 @@ logger = logging.getLogger(__name__)
 # If direct access is needed here for some reason, this might need adjustment.
 agents = {} 
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 class RunRequest(BaseModel):
     """Defines the request model for running an agent.
@@ -74,7 +81,7 @@ async def _delayed_shutdown():
     # Exit the process to trigger graceful shutdown
     os._exit(0)
 
-@app.post("/{agent_name}/run")
+@app.post("/{agent_name}/run", response_class=FastJSONResponse, response_model=None)
 async def run_agent_endpoint(agent_name: str, req: RunRequest):
     """Handles POST requests to run a specific agent.
 
@@ -89,27 +96,21 @@ async def run_agent_endpoint(agent_name: str, req: RunRequest):
         HTTPException: If the specified agent_name is not found.
 
     Returns:
-        dict: A dictionary confirming the agent has started.
+        FastJSONResponse: A response confirming the agent has started, serialized
+        directly rather than through FastAPI's response encoding.
     """
-    logger.info(f"Received request for agent {agent_name} with prompt: {req.prompt}")
-    logger.info(f"Available agents: {list(agents.keys())}")
-    if agent_name not in agents:
-        logger.error(f"Agent {agent_name} not found. Available: {list(agents.keys())}")
-        raise HTTPException(422, f"Unknown agent {agent_name}")
-    
-    # Ensure the agent object is correctly retrieved
+    logger.info("Received request for agent %s with prompt: %s", agent_name, req.prompt)
+    # Single lookup; the list of available agents is only built when logging an error
     agent_instance = agents.get(agent_name)
-    if not agent_instance:
-        # This case should ideally be caught by the 'agent_name not in agents' check,
-        # but as a safeguard:
-        logger.error(f"Agent object for {agent_name} is None or empty.")
-        raise HTTPException(500, f"Internal error retrieving agent {agent_name}")
+    if agent_instance is None:
+        logger.error("Agent %s not found. Available: %s", agent_name, list(agents))
+        raise HTTPException(422, f"Unknown agent {agent_name}")
 
     try:
         # fire-and-forget
         await start_agent(agent_instance, req.prompt)
-        logger.info(f"Successfully started agent {agent_name}")
-        return {"status": "started", "agent": agent_name}
+        logger.info("Successfully started agent %s", agent_name)
+        return FastJSONResponse({"status": "started", "agent": agent_name})
     except Exception as e:
         logger.error(f"Error starting agent {agent_name}: {e}", exc_info=True)
         raise HTTPException(500, f"Error starting agent {agent_name}")
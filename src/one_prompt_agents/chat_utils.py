@@ -5,32 +5,59 @@ and agent interactions within the one-prompt-agents framework.
 Contents:
 - `spinner`: An asynchronous context manager that displays an animated console spinner
   to indicate background activity (e.g., while an agent is processing).
-- `CaptureLastAssistant`: A `RunHooks` implementation used to intercept and store
-  an agent's messages and log tool initiations. Useful for history tracking or debugging.
 - `connect_mcps`: An asynchronous function to handle the connection logic for an agent
-  to its associated MCP (Multi-Context Platform) servers, including retries.
+  to its associated MCP (Multi-Context Platform) servers, including retries. Servers
+  stay connected across calls until they are cleaned up (see `cleanup_mcp_server`).
+- `cleanup_mcp_server`: Closes an MCP server connection and forgets it.
 
 These utilities are designed to be general-purpose helpers for different parts of the
 chat and agent execution pipeline.
 """
 import asyncio
-import itertools
+import os
 import sys
+import time
 import logging
 from contextlib import asynccontextmanager
-from agents import RunHooks # Assuming RunHooks is from the 'agents' library
-from typing import List, Any # Added Any for agent type hint
+from typing import List, Any, Dict, Set # Added Any for agent type hint
 
 logger = logging.getLogger(__name__)
 
 SPINNER_FRAMES = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
+SPINNER_FPS = 8  # 125 ms per frame, indistinguishable from faster rates
+_STDOUT_FD = 1
+_CLEAR_LINE = b"\r\033[2K\r"
+# Timeout of a single MCP connection attempt, in seconds
+CONNECT_TIMEOUT = 10
+
+# MCP servers (by id) that are already connected, shared by every agent and job
+_CONNECTED: Set[int] = set()
+# One lock per server so concurrent jobs don't connect the same server twice
+_CONNECT_LOCKS: Dict[int, asyncio.Lock] = {}
+
+def _is_connected(mcp_server: Any) -> bool:
+    """Whether `mcp_server` was connected here and its session hasn't been cleaned up since."""
+    if id(mcp_server) not in _CONNECTED:
+        return False
+    if getattr(mcp_server, 'session', True) is None:  # cleanup() drops the client session
+        _CONNECTED.discard(id(mcp_server))
+        return False
+    return True
+
+def _write_stdout(data: bytes) -> None:
+    """Writes raw bytes straight to the stdout file descriptor, bypassing sys.stdout."""
+    try:
+        os.write(_STDOUT_FD, data)
+    except BlockingIOError:
+        pass  # non-blocking tty momentarily full, drop the frame
 
 @asynccontextmanager
 async def spinner(text: str = ""):
     """An asynchronous context manager that displays an animated spinner in the console.
 
     Useful for indicating background activity during long-running asynchronous operations.
-    The spinner is displayed next to the provided `text`.
+    The spinner is displayed next to the provided `text`. Nothing is drawn when stdout is
+    not a terminal or the `NO_SPINNER` environment variable is set.
 
     Args:
         text (str, optional): Text to display next to the spinner. Defaults to "".
@@ -39,35 +66,74 @@ async def spinner(text: str = ""):
         async with spinner("Processing..."):
             await some_long_async_task()
     """
-    stop = asyncio.Event()
-
-    async def _spin() -> None:
-        """Internal helper function to manage the spinner animation loop."""
-        frames = itertools.cycle(SPINNER_FRAMES)
-        while not stop.is_set():
-            frame = next(frames)
-            sys.stdout.write(f"\r{frame} {text}")
-            sys.stdout.flush()
-            try:
-                await asyncio.wait_for(stop.wait(), 0.1)  # ~10 FPS
-            except asyncio.TimeoutError:
-                pass
-        sys.stdout.write("\r\033[2K\r")  # Clear the spinner line
-        sys.stdout.flush()
+    if not os.isatty(_STDOUT_FD) or os.environ.get("NO_SPINNER"):
+        # Redirected to a file or pipe (frames would only pile up as noise), or disabled
+        yield
+        return
 
-    task = asyncio.create_task(_spin())
+    # Frames are encoded once and written with a single write(2) each; this also keeps
+    # them out of sys.stdout, which may be a StreamToLogger that logs every flush.
+    lines = tuple(f"\r{frame} {text}".encode() for frame in SPINNER_FRAMES)
+    n_frames = len(lines)
+    sys.stdout.flush()  # anything already printed must appear before the first frame
+    loop = asyncio.get_running_loop()
+    t0 = time.monotonic()
+    last_idx = -1
+    handle: asyncio.Handle
+
+    def _tick() -> None:
+        """Draws the current frame and schedules the next tick on the event loop."""
+        nonlocal last_idx, handle
+        # Frame follows the clock, so a late wakeup never draws the same frame twice
+        idx = int((time.monotonic() - t0) * SPINNER_FPS) % n_frames
+        if idx != last_idx:
+            _write_stdout(lines[idx])
+            last_idx = idx
+        handle = loop.call_later(1 / SPINNER_FPS, _tick)
+
+    # A self-rescheduling timer callback: no task, event or sleep per spinner
+    handle = loop.call_soon(_tick)
     try:
         yield
     finally:
-        stop.set()
-        await task
+        handle.cancel()
+        _write_stdout(_CLEAR_LINE)  # Clear the spinner line
 
 
+async def _connect_one(mcp_server: Any, agent_name: str, retries: int) -> None:
+    """Connects a single MCP server, retrying with exponential backoff (2s, 4s, 8s, ...)."""
+    key = id(mcp_server)
+    if _is_connected(mcp_server):
+        return
+    server_name = getattr(mcp_server, 'name', 'UnnamedMCPServer')
+    async with _CONNECT_LOCKS.setdefault(key, asyncio.Lock()):
+        if _is_connected(mcp_server):  # connected by another job while we waited for the lock
+            return
+        logger.info("Connecting to MCP server: %s for agent %s", server_name, agent_name)
+        for attempt in range(1, retries + 1):
+            try:
+                # Assuming mcp_server objects have a connect() method that is awaitable
+                await asyncio.wait_for(mcp_server.connect(), timeout=CONNECT_TIMEOUT)
+                _CONNECTED.add(key)
+                logger.info("✅ Successfully connected to %s on attempt %s for agent %s", server_name, attempt, agent_name)
+                return
+            except Exception as err:
+                logger.warning("❌ Attempt %s to connect to %s for agent %s failed: %r", attempt, server_name, agent_name, err)
+                if attempt == retries:
+                    logger.error("Final attempt to connect to %s for agent %s failed. Raising error.", server_name, agent_name)
+                    raise
+                delay = 2 ** attempt
+                logger.info("Retrying connection to %s in %ss…", server_name, delay)
+                await asyncio.sleep(delay)
+
 async def connect_mcps(agent: Any, retries: int = 3):
     """Connects the agent to its associated MCP (Multi-Context Platform) servers.
 
-    Attempts to connect to each MCP server defined in `agent.mcp_servers`.
-    Retries connection up to `retries` times with a short delay between attempts.
+    Connects to all MCP servers defined in `agent.mcp_servers` concurrently, so the
+    total wait is that of the slowest server rather than the sum over all of them.
+    Each connection is retried up to `retries` times with exponential backoff, and the
+    whole bundle is capped at the worst case of those retries plus a small margin.
+    Servers that are already connected are reused without a new handshake.
 
     Args:
         agent: The agent instance, which should have an `mcp_servers` attribute list
@@ -75,31 +141,40 @@ async def connect_mcps(agent: Any, retries: int = 3):
         retries (int, optional): The number of connection attempts per server. Defaults to 3.
 
     Raises:
-        Exception: Bubbles up the exception from the last failed connection attempt.
+        Exception: Bubbles up the exception from the last failed connection attempt of
+            the first server that could not be connected (each failure is logged).
+        asyncio.TimeoutError: If the connections together exceed their time budget.
     """
     agent_name = getattr(agent, 'name', 'UnnamedAgent')
     mcp_servers_list = getattr(agent, 'mcp_servers', [])
     
-    logger.info(f"Connecting to MCP servers for agent: {agent_name}")
-    logger.debug(f"Agent {agent_name} MCP servers: {mcp_servers_list}")
+    logger.info("Connecting to MCP servers for agent: %s", agent_name)
+    logger.debug("Agent %s MCP servers: %s", agent_name, mcp_servers_list)
 
     if not mcp_servers_list:
-        logger.info(f"No MCP servers defined for agent {agent_name}.")
+        logger.info("No MCP servers defined for agent %s.", agent_name)
         return
 
-    for mcp_server in mcp_servers_list:
-        server_name = getattr(mcp_server, 'name', 'UnnamedMCPServer')
-        logger.info(f"Connecting to MCP server: {server_name} for agent {agent_name}")
-        for attempt in range(1, retries + 1):
-            try:
-                # Assuming mcp_server objects have a connect() method that is awaitable
-                await asyncio.wait_for(mcp_server.connect(), timeout=10)
-                logger.info(f"✅ Successfully connected to {server_name} on attempt {attempt} for agent {agent_name}")
-                break
-            except Exception as err:
-                logger.warning(f"❌ Attempt {attempt} to connect to {server_name} for agent {agent_name} failed: {err!r}")
-                if attempt == retries:
-                    logger.error(f"Final attempt to connect to {server_name} for agent {agent_name} failed. Raising error.")
-                    raise
-                logger.info(f"Retrying connection to {server_name} in 2s…")
-                await asyncio.sleep(2) 
\ No newline at end of file
+    # Every attempt timing out plus every backoff sleep, plus a margin
+    budget = retries * CONNECT_TIMEOUT + 2 ** retries + 5
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            *(_connect_one(mcp_server, agent_name, retries) for mcp_server in mcp_servers_list),
+            return_exceptions=True,  # let the other servers finish connecting
+        ),
+        timeout=budget,
+    )
+    errors = [(mcp_server, res) for mcp_server, res in zip(mcp_servers_list, results) if isinstance(res, BaseException)]
+    for mcp_server, err in errors:
+        logger.error("Could not connect MCP server %s for agent %s: %r", getattr(mcp_server, 'name', 'UnnamedMCPServer'), agent_name, err)
+    if errors:
+        raise errors[0][1]
+
+async def cleanup_mcp_server(mcp_server: Any) -> None:
+    """Cleans up an MCP server connection and forgets it, so `connect_mcps` would reconnect it.
+
+    Args:
+        mcp_server: The MCP server (e.g. an `MCPServerSse`) to clean up.
+    """
+    _CONNECTED.discard(id(mcp_server))
+    await mcp_server.cleanup()
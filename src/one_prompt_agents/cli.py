@@ -25,16 +25,23 @@ import logging
 from pathlib import Path
 
 from one_prompt_agents.agents_loader import discover_configs, topo_sort, load_agents
-from one_prompt_agents.core_chat import chat_worker, user_chat
+from one_prompt_agents.core_chat import start_workers, user_chat
+from one_prompt_agents.chat_utils import cleanup_mcp_server
 from one_prompt_agents.job_manager import submit_job, JOBS # Ensure JOBS is imported
 from one_prompt_agents.mcp_servers_loader import collect_servers
-from one_prompt_agents.logging_setup import setup_logging
+from one_prompt_agents.logging_setup import setup_logging, stop_log_listener
 from one_prompt_agents.http_start import ensure_server, trigger
 from one_prompt_agents.utils import uvicorn_log_level
 
 # Import the new modules
 from one_prompt_agents.api import app as fastapi_app, set_agents_for_api
 from one_prompt_agents.mcp_setup import mcp as main_mcp, start_mcp_server, set_agents_for_mcp_setup, set_job_queue_for_mcp_setup
+from one_prompt_agents.mcp_agent import start_agent_mcp_server
+
+try:
+    import uvloop
+except ImportError:  # optional (and unavailable on Windows), the default asyncio loop is used otherwise
+    uvloop = None
 
 logger = logging.getLogger(__name__)
 
@@ -59,14 +66,14 @@ def run_server_cli():
     else:
         logger.error("Failed to ensure server is running. Cannot trigger agent.")
 
+NUM_WORKERS = 4  # Number of chat workers sharing the job queue
+
 def main_cli():
     """The main command-line interface entry point for the application.
 
-    Orchestrates application setup, agent loading, and run mode execution based on CLI args.
+    Parses CLI args and configures logging, then runs `_main` with `asyncio.run`,
+    which owns the event loop for the whole application lifetime.
     """
-    global AGENTS_REGISTRY
-    NUM_WORKERS = 4  # Define the number of workers
-
     parser = argparse.ArgumentParser(description="One-Prompt Agents Framework CLI")
     parser.add_argument("agent_name", nargs="?", help="Agent to target for REPL or autonomous run")
     parser.add_argument("prompt", nargs="?", help="Input prompt for autonomous mode. If provided with agent_name, runs autonomously.")
@@ -91,6 +98,36 @@ def main_cli():
         # or rely on its default DEBUG for file and basicConfig for console.
         setup_logging(log_to_file=args.log_to_file, level=args.log_level or logging.INFO)
 
+    # Must happen before asyncio.run creates the event loop
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        logger.info("Keyboard interrupt received.")
+    finally:
+        stop_log_listener()  # drain queued records before the handlers are closed
+        logging.shutdown()
+        print("Application shutdown complete.")
+
+async def _main(args: argparse.Namespace) -> None:
+    """Starts all components on the running loop, runs the selected mode, then shuts down.
+
+    Args:
+        args (argparse.Namespace): The parsed CLI arguments (see `main_cli`).
+    """
+    global AGENTS_REGISTRY
+    loop = asyncio.get_running_loop()
+
+    # SIGINT/SIGTERM end the current mode and lead to the graceful shutdown below
+    stop_event = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:  # e.g. Windows; KeyboardInterrupt still ends asyncio.run
+            pass
+
     logger.info("Starting main MCP server...")
     main_mcp_task = start_mcp_server() # From mcp_setup.py
 
@@ -103,12 +140,8 @@ def main_cli():
     configs = discover_configs(Path("agents_config"))
     load_order = topo_sort(configs)
 
-    loop = asyncio.get_event_loop()
-    for sig in (signal.SIGINT, signal.SIGTERM):
-        loop.add_signal_handler(sig, loop.stop)
-
-    job_queue = asyncio.Queue()
-    worker_tasks = [loop.create_task(chat_worker(job_queue)) for _ in range(NUM_WORKERS)]
+    job_queue = asyncio.PriorityQueue()  # entries are built by job_manager.enqueue_job
+    worker_tasks = start_workers(job_queue, NUM_WORKERS, loop)
     logger.info(f"Started {NUM_WORKERS} chat workers.")
 
     # Pass the job queue to the mcp_setup module so it can add queue-dependent tools
@@ -118,10 +151,25 @@ def main_cli():
     server_instance = None # Initialize server_instance
     should_start_server = False # Flag to control server startup
 
+    async def until_stopped(coro) -> None:
+        """Runs `coro` until it finishes or a stop signal arrives, whichever comes first."""
+        task = asyncio.ensure_future(coro)
+        stop_task = asyncio.ensure_future(stop_event.wait())
+        await asyncio.wait({task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+        stop_task.cancel()
+        if not task.done():
+            logger.info("Stop signal received.")
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return
+        task.result()  # re-raise errors from the mode itself
+
     try:
         logger.info("Loading agents...")
         AGENTS_REGISTRY = load_agents(configs, load_order, mcp_servers, job_queue)
         logger.info(f"Loaded agents: {list(AGENTS_REGISTRY.keys())}")
+        # A single SSE server for the tools of all loaded agents
+        mcp_tasks.append(start_agent_mcp_server())
 
         set_agents_for_api(AGENTS_REGISTRY)
         set_agents_for_mcp_setup(AGENTS_REGISTRY)
@@ -133,7 +181,7 @@ def main_cli():
             if not target_mcp_agent:
                 logger.error(f"Agent {args.agent_name} not found for REPL mode.")
                 raise ValueError(f"Agent {args.agent_name} not found.")
-            loop.run_until_complete(user_chat(target_mcp_agent))
+            await until_stopped(user_chat(target_mcp_agent))
             logger.info("Interactive REPL terminated by user.")
             # In REPL mode, we typically don't start the server afterwards.
             should_start_server = False
@@ -194,10 +242,10 @@ def main_cli():
 
                 logger.info(f"Job {job_id} and all other jobs in the system (based on JOBS dict and queue observation) are completed.")
             
-            loop.run_until_complete(run_job_and_wait())
+            await until_stopped(run_job_and_wait())
             logger.info("Autonomous console run completed.")
             # After autonomous run, proceed to start the server.
-            should_start_server = True
+            should_start_server = not stop_event.is_set()
 
         else: # Default to server mode if no specific mode selected
             logger.info("No specific agent/prompt provided. Defaulting to HTTP server mode.")
@@ -205,27 +253,14 @@ def main_cli():
 
         if should_start_server:
             logger.info("Starting HTTP server...")
-            config = uvicorn.Config(fastapi_app, host="127.0.0.1", port=9000, loop="asyncio", log_level=uvicorn_log_level())
+            # http defaults to "auto", which already picks the httptools parser when it is installed
+            config = uvicorn.Config(fastapi_app, host="127.0.0.1", port=9000, loop="uvloop" if uvloop else "asyncio", log_level=uvicorn_log_level())
             server_instance = uvicorn.Server(config) # Assign to server_instance
-            server_task = loop.create_task(server_instance.serve()) # Use server_instance
-            logger.info("HTTP server started. Running event loop forever.")
-            try:
-                # Only run forever if the server is meant to be the primary mode or after an autonomous run.
-                # If loop.stop() was called by run_job_and_wait or REPL, this might exit quickly.
-                # We need to ensure it runs if the server is up.
-                if not loop.is_closed() and not loop.is_running(): # If loop was stopped e.g. by run_job_and_wait
-                     loop.run_forever() # Restart it for the server
-                elif not loop.is_closed(): # If it's already running (e.g. first time server start)
-                    pass # It will be handled by the existing run_forever or specific run_until_complete
-                # If the loop is already running because of other tasks, loop.run_forever() might not be needed
-                # if the server_task keeps it alive.
-                # For explicit server mode, loop.run_forever() is typical.
-                # Let's ensure loop.run_forever() is called if server is up and no other mode stopped the loop.
-                if server_task and not server_task.done():
-                    loop.run_forever()
-
-            except KeyboardInterrupt:
-                logger.info("Keyboard interrupt received. Shutting down server.")
+            server_task = asyncio.create_task(server_instance.serve()) # Use server_instance
+            logger.info("HTTP server started. Serving until stopped.")
+            stop_task = asyncio.create_task(stop_event.wait())
+            await asyncio.wait({server_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+            stop_task.cancel()
             # The finally block will handle server shutdown
             
     except ValueError as err:
@@ -234,75 +269,46 @@ def main_cli():
         logger.error(f"An unexpected error occurred: {e}", exc_info=True)
     finally:
         logger.info("Initiating graceful shutdown...")
-
-        async def shutdown_async():
-            """Gathers and runs all async cleanup tasks concurrently."""
-            logger.info("--- Starting Async Shutdown Sequence ---")
-
-            # 1. Shutdown Uvicorn HTTP server if it was started
-            if server_task and server_instance and server_instance.started:
-                logger.info("Shutting down main Uvicorn HTTP server...")
-                try:
-                    await server_instance.shutdown()
-                    logger.info("Main Uvicorn HTTP server shut down.")
-                except Exception as e:
-                    logger.error(f"Error shutting down Uvicorn: {e}", exc_info=True)
-            elif server_task and not server_task.done():
-                server_task.cancel()
-
-            # 2. Gather all agent and external server cleanup coroutines
-            cleanup_coroutines = []
-            logger.info(f"Gathering cleanup tasks for agents: {list(AGENTS_REGISTRY.keys())}")
-            for agent in AGENTS_REGISTRY.values():
-                if hasattr(agent, 'end_and_cleanup'):
-                    cleanup_coroutines.append(agent.end_and_cleanup())
-            
-            logger.info(f"Gathering cleanup tasks for external MCP servers: {list(mcp_servers.keys())}")
-            for srv in mcp_servers.values():
-                if hasattr(srv, 'cleanup'):
-                    cleanup_coroutines.append(srv.cleanup())
-            
-            # Run all cleanup coroutines concurrently
-            if cleanup_coroutines:
-                logger.info(f"Executing {len(cleanup_coroutines)} cleanup coroutines...")
-                results = await asyncio.gather(*cleanup_coroutines, return_exceptions=True)
-                for res in results:
-                    if isinstance(res, Exception):
-                        logger.error(f"Error during async cleanup: {res}", exc_info=res)
-                logger.info("Agent and server cleanup coroutines finished.")
-
-            # 3. Cancel all remaining top-level tasks (workers, main MCP, etc.)
-            tasks_to_cancel = mcp_tasks + worker_tasks
-            logger.info(f"Cancelling {len(tasks_to_cancel)} background tasks...")
-            for task in tasks_to_cancel:
-                if not task.done():
-                    task.cancel()
-            
-            await asyncio.gather(*tasks_to_cancel, return_exceptions=True)
-            logger.info("Background tasks cancelled.")
-
-            # 4. Shutdown default executor for threads
-            logger.info("Shutting down default executor...")
-            await loop.shutdown_default_executor()
-            logger.info("Default executor shut down.")
-            logger.info("--- Async Shutdown Sequence Complete ---")
-
-        if not loop.is_closed():
-            logger.info("Running final shutdown sequence.")
-            loop.run_until_complete(shutdown_async())
-            
-            # Add a small delay to allow cancelled tasks to finish their cleanup
-            # before the event loop is closed. This prevents "Event loop is closed" errors.
-            logger.info("Draining event loop before final close...")
-            loop.run_until_complete(asyncio.sleep(0.1))
-
-            loop.close()
-            logger.info("Event loop closed.")
-        else:
-            logger.info("Event loop was already closed.")
+        logger.info("--- Starting Async Shutdown Sequence ---")
+
+        # 1. Gather the HTTP server, agent and external server cleanup coroutines; they are
+        # independent, so shutdown takes as long as the slowest one rather than their sum
+        cleanup_coroutines = []
+        if server_task and not server_task.done():
+            logger.info("Shutting down main Uvicorn HTTP server...")
+            server_instance.should_exit = True  # serve() then runs its own graceful shutdown
+            cleanup_coroutines.append(server_task)
+
+        logger.info(f"Gathering cleanup tasks for agents: {list(AGENTS_REGISTRY.keys())}")
+        for agent in AGENTS_REGISTRY.values():
+            if hasattr(agent, 'end_and_cleanup'):
+                cleanup_coroutines.append(agent.end_and_cleanup())
         
-        logging.shutdown()
-        print("Application shutdown complete.")
+        logger.info(f"Gathering cleanup tasks for external MCP servers: {list(mcp_servers.keys())}")
+        for srv in mcp_servers.values():
+            if hasattr(srv, 'cleanup'):
+                cleanup_coroutines.append(cleanup_mcp_server(srv))
+        
+        # Run all cleanup coroutines concurrently
+        if cleanup_coroutines:
+            logger.info(f"Executing {len(cleanup_coroutines)} cleanup coroutines...")
+            results = await asyncio.gather(*cleanup_coroutines, return_exceptions=True)
+            for res in results:
+                if isinstance(res, Exception):
+                    logger.error(f"Error during async cleanup: {res}", exc_info=res)
+            logger.info("Agent and server cleanup coroutines finished.")
+
+        # 2. Cancel all remaining top-level tasks (workers, main MCP, etc.)
+        tasks_to_cancel = mcp_tasks + worker_tasks
+        logger.info(f"Cancelling {len(tasks_to_cancel)} background tasks...")
+        for task in tasks_to_cancel:
+            if not task.done():
+                task.cancel()
+        
+        await asyncio.gather(*tasks_to_cancel, return_exceptions=True)
+        logger.info("Background tasks cancelled.")
+        # asyncio.run shuts down the default executor and closes the loop after this returns
+        logger.info("--- Async Shutdown Sequence Complete ---")
 
 if __name__ == "__main__":
     # This allows running: python -m one_prompt_agents.cli <args>
@@ -10,6 +10,8 @@ Key functionalities:
   chat with an agent via the console.
 - `chat_worker`: An asynchronous worker that processes jobs from a queue. It checks job
   dependencies and then uses `autonomous_chat` to execute each job.
+- `start_workers`: Starts several `chat_worker`s on a shared queue so independent jobs
+  run concurrently, with at most `MAX_JOBS_PER_AGENT` running per agent.
 
 This module relies on other components:
 - `strategies.py` for selecting and applying chat termination strategies.
@@ -17,15 +19,20 @@ This module relies on other components:
 - `chat_utils.py` for utilities like `spinner`, `connect_mcps`.
 """
 import asyncio
+import atexit
+import json
 import logging
-from typing import Any, List, Dict, Optional, TYPE_CHECKING
+import os
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, List, Dict, Optional, TYPE_CHECKING
 
-from agents import Runner, trace, enable_verbose_stdout_logging
+from agents import Runner, trace
 from agents.exceptions import ModelBehaviorError # <-- Import ModelBehaviorError
 
 # Imports from newly created modules
 from .strategies import get_chat_strategy, ChatEndStrategy # Assuming ChatEndStrategy is needed for type hints
-from .job_manager import Job, get_job, get_done_jobs # JOBS is managed within job_manager
+from .job_manager import Job, get_job, enqueue_job, is_job_finished, mark_job_done, set_job_status, get_cached_plan, cache_plan # JOBS is managed within job_manager
 from .chat_utils import spinner, connect_mcps
 
 if TYPE_CHECKING:
@@ -33,6 +40,115 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on jobs of the same agent running at once across all workers, so a fan-out
+# to one agent doesn't hit its model/tool rate limits all at the same time. Kept below the
+# default worker count (4), so the other workers stay free for other agents' jobs.
+MAX_JOBS_PER_AGENT = int(os.getenv("MAX_JOBS_PER_AGENT", "2"))
+# Jobs running per agent name, and jobs set aside because their agent was at the limit
+_running_per_agent: Dict[str, int] = defaultdict(int)
+_deferred_per_agent: Dict[str, Deque[Job]] = defaultdict(deque)
+_EXIT_COMMANDS: frozenset[str] = frozenset({"/exit", "/quit", "exit", "quit"})
+# A single warm thread for blocking console reads in user_chat
+_INPUT_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="user-input")
+atexit.register(_INPUT_EXECUTOR.shutdown, wait=False)
+# Role of the messages the framework adds on the user's behalf
+_USER_ROLE = "user"
+# Rolling window of conversation items sent back to the model on each autonomous turn
+MAX_HISTORY_MESSAGES = 50
+# Fallback poll interval for dependencies that are not (yet) registered in JOBS
+DEPENDENCY_POLL_SECONDS = 30
+# Strong references to the requeue tasks, so they are not garbage collected while waiting
+_requeue_tasks: set = set()
+
+def _trim_history(history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Bounds the history, in place, to roughly the last `MAX_HISTORY_MESSAGES` items.
+
+    The opening items up to the first user message (system prompt and the job's initial
+    request) are always kept. The kept tail starts at a user message, so tool calls are
+    never separated from their outputs. The same list is returned, so the transcript is
+    owned by one list for the whole run instead of being rebuilt on every trim.
+    """
+    if len(history) <= MAX_HISTORY_MESSAGES:
+        return history
+    head_end = next((i + 1 for i, item in enumerate(history) if item.get("role") == _USER_ROLE), 0)
+    start = max(head_end, len(history) - MAX_HISTORY_MESSAGES)
+    while start < len(history) and history[start].get("role") != _USER_ROLE:
+        start += 1
+    if start >= len(history):
+        return history  # no safe cut point
+    del history[head_end:start]
+    return history
+
+def _merge_history(history: List[Dict[str, Any]], run_result: Any) -> List[Dict[str, Any]]:
+    """Extends `history` (the run's input) with only the items the run produced.
+
+    `to_input_list()` deep-copies the whole input on every call; the input is already in
+    `history`, so only the new items need converting. Falls back to it for results that
+    don't expose `new_items`.
+    """
+    new_items = getattr(run_result, "new_items", None)
+    if new_items is None:
+        return run_result.to_input_list()
+    history.extend(item.to_input_item() for item in new_items)
+    return history
+
+def _plan_snapshot(final_output: Any) -> Optional[List[Any]]:
+    """Returns the plan of an agent output as JSON-serializable data, or None if it has none."""
+    plan = final_output.get("plan") if isinstance(final_output, dict) else getattr(final_output, "plan", None)
+    if not plan:
+        return None
+    return [step.model_dump() if hasattr(step, "model_dump") else step for step in plan]
+
+def _finish_job(job: Job, final_output: Any) -> None:
+    """Marks `job` done and caches its final plan for identical jobs."""
+    mark_job_done(job)
+    plan = _plan_snapshot(final_output)
+    if plan and job.fingerprint:
+        cache_plan(job.fingerprint, plan)
+
+def _drop_pending(history: List[Dict[str, Any]], message: Dict[str, Any]) -> None:
+    """Removes `message` from `history` if a failed turn left it there.
+
+    Tools may have added notes after it during the turn, so it is looked up from the end.
+    """
+    for i in range(len(history) - 1, -1, -1):
+        if history[i] is message:
+            del history[i]
+            return
+
+async def _requeue_when_ready(job: Job, dep_ids: List[str], queue: "asyncio.PriorityQueue") -> None:
+    """Puts `job` back on the queue as soon as all its dependencies have finished.
+
+    Dependencies that ended in 'error' count as finished too; the job runs and can
+    inspect their status rather than waiting forever.
+    """
+    deps = [get_job(dep_id) for dep_id in dep_ids]
+    if all(deps):
+        await asyncio.gather(*(dep.done_event.wait() for dep in deps))
+    else:
+        # Unknown job ids have no event to wait on, check again later
+        await asyncio.sleep(DEPENDENCY_POLL_SECONDS)
+    await enqueue_job(queue, job)
+    logger.info("Job %s requeued after its dependencies changed.", job.job_id)
+
+def _wait_for_dependencies(job: Job, queue: "asyncio.PriorityQueue") -> bool:
+    """Parks `job` until its unmet dependencies finish, then puts it back on the queue.
+
+    The wait happens on the dependencies' `done_event`s in a background task, so neither
+    the job nor any worker goes around the queue while the dependencies are running.
+
+    Returns:
+        bool: False if every dependency has already finished (nothing was scheduled).
+    """
+    unmet_dependencies = [dep_id for dep_id in job.depends_on if not is_job_finished(dep_id)]
+    if not unmet_dependencies:
+        return False
+    logger.info("Job %s has unmet dependencies: %s. Requeuing once they are done.", job.job_id, unmet_dependencies)
+    task = asyncio.create_task(_requeue_when_ready(job, unmet_dependencies, queue))
+    _requeue_tasks.add(task)
+    task.add_done_callback(_requeue_tasks.discard)
+    return True
+
 
 async def autonomous_chat(job: Job, max_turns: int = 15) -> None:
     """Manages an autonomous chat session for a given job.
@@ -44,7 +160,6 @@ async def autonomous_chat(job: Job, max_turns: int = 15) -> None:
         job (Job): The job to be processed.
         max_turns (int, optional): Maximum number of turns for the autonomous session. Defaults to 15.
     """
-    enable_verbose_stdout_logging()
     await connect_mcps(job.agent) # connect_mcps is now in chat_utils
 
     trace_id = f"autonomous-chat-{job.agent.name}-{job.job_id}"
@@ -57,35 +172,56 @@ async def autonomous_chat(job: Job, max_turns: int = 15) -> None:
         current_user_message_content: str
 
         if not job.chat_history:  # New job
-            current_conversation_history = []
+            current_conversation_history = job.chat_history = []
             initial_prompt_parts = []
             if job.job_id:
                 initial_prompt_parts.append(f"Your JOB_ID is {job.job_id}.")
             initial_prompt_parts.append(job.text)
             if prompt_strategy.start_instruction:
                 initial_prompt_parts.append(prompt_strategy.start_instruction)
+                # A job identical to an earlier completed one gets that job's plan as a
+                # starting point; its steps come back unchecked, so the work is still done
+                cached_plan = get_cached_plan(job.fingerprint) if job.fingerprint else None
+                if cached_plan is not None:
+                    initial_prompt_parts.append(
+                        f"An identical earlier job succeeded with this plan, adapt it as your starting plan: {json.dumps(cached_plan, default=str)}"
+                    )
+                    logger.info("Job %s: Reusing the cached plan of an identical job.", job.job_id)
             current_user_message_content = " ".join(initial_prompt_parts)
-            logger.info(f"Starting new job {job.job_id} with initial prompt: {current_user_message_content}")
+            logger.info("Starting new job %s with initial prompt: %s", job.job_id, current_user_message_content)
         else:  # Resuming job
-            current_conversation_history = job.chat_history.copy()
+            current_conversation_history = job.chat_history
             current_user_message_content = "Jobs waited have ended. Resume your task."
-            logger.info(f"Resuming job {job.job_id} with history. Resume prompt: {current_user_message_content}")
+            logger.info("Resuming job %s with history. Resume prompt: %s", job.job_id, current_user_message_content)
+
+        def _checkpoint() -> None:
+            """Saves the transcript on the job; only done where the run stops or fails.
+
+            The transcript is the job's own list, extended in place, so notes that tools add
+            to `job.chat_history` during a run (e.g. `wait_for_jobs`) are kept. This only
+            rebinds it in case a merge had to fall back to a new list.
+            """
+            job.chat_history = current_conversation_history
 
         for check in range(1, max_turns + 1):
             try:
-                logger.info(f"Job {job.job_id}: Turn {check}/{max_turns}")
-                turn_input_for_api = current_conversation_history + [{"role": "user", "content": current_user_message_content}]
+                logger.info("Job %s: Turn %s/%s", job.job_id, check, max_turns)
+                # Extend the history in place rather than copying it into a new list every turn;
+                # the run's new items are added to it on success.
+                turn_message = {"role": _USER_ROLE, "content": current_user_message_content}
+                current_conversation_history.append(turn_message)
                 
                 try:                    
-                    single_agent_run = await Runner.run(job.agent, input=turn_input_for_api)
+                    single_agent_run = await Runner.run(job.agent, input=current_conversation_history)
                     
-                    logger.debug(f"Job {job.job_id}: Agent run output object: {single_agent_run}")
+                    logger.debug("Job %s: Agent run output object: %s", job.job_id, single_agent_run)
                     final_output_data = single_agent_run.final_output # This is already the parsed Pydantic model or dict
-                    logger.info(f"Job {job.job_id}: Agent run final output: {final_output_data}")
-                    logger.info(f"Job {job.job_id}: Trace URL: https://platform.openai.com/traces/{tr.trace_id}")
+                    logger.info("Job %s: Agent run final output: %s", job.job_id, final_output_data)
+                    logger.info("Job %s: Trace URL: https://platform.openai.com/traces/%s", job.job_id, tr.trace_id)
 
-                    current_conversation_history = single_agent_run.to_input_list()
-                    job.chat_history = current_conversation_history.copy()
+                    current_conversation_history = _trim_history(
+                        _merge_history(current_conversation_history, single_agent_run)
+                    )
 
                     # Safely access summary from the final_output_data
                     if isinstance(final_output_data, dict) and "summary" in final_output_data:
@@ -103,24 +239,28 @@ async def autonomous_chat(job: Job, max_turns: int = 15) -> None:
                     )
 
                     if end_agent_run:
-                        logger.info(f"Job {job.job_id}: Strategy indicates completion after {check} turn(s)." )
-                        job.status = 'done'
-                        logger.info(f"Job {job.job_id}: Status set to 'done' by autonomous_chat.")
+                        logger.info("Job %s: Strategy indicates completion after %s turn(s).", job.job_id, check)
+                        _checkpoint()
+                        _finish_job(job, final_output_data)
+                        logger.info("Job %s: Status set to 'done' by autonomous_chat.", job.job_id)
                         return
                     else:
-                        if job.status == "in_queue": # If job was re-queued by a tool like _start_and_wait
-                            logger.info(f"Job {job.job_id} was moved back to queue. Halting autonomous_chat for this iteration.")
+                        if job.status == "in_queue": # If job was set to wait by a tool like _start_and_wait
+                            _checkpoint()  # the resumed run continues from here
+                            logger.info("Job %s was moved back to queue. Halting autonomous_chat for this iteration.", job.job_id)
                             return
                         current_user_message_content = new_user_request_content
                         if not current_user_message_content:
-                            logger.warning(f"Job {job.job_id}: Strategy returned no content for next turn. Ending run.")
-                            job.status = 'error' # Or some other status to indicate an issue
+                            logger.warning("Job %s: Strategy returned no content for next turn. Ending run.", job.job_id)
+                            _checkpoint()
+                            set_job_status(job, 'error') # Or some other status to indicate an issue
                             job.summary = (job.summary or "") + " Error: Strategy returned no content for next turn."
                             return 
-                        logger.info(f"Job {job.job_id}: New user request for next turn: {current_user_message_content[:100]}...")
+                        logger.info("Job %s: New user request for next turn: %s...", job.job_id, current_user_message_content[:100])
 
                 except ModelBehaviorError as e:
-                    logger.error(f"Job {job.job_id}: ModelBehaviorError during turn {check}: {e}", exc_info=True)
+                    _drop_pending(current_conversation_history, turn_message)
+                    logger.error("Job %s: ModelBehaviorError during turn %s: %s", job.job_id, check, e, exc_info=True)
                     # Attempt to get the raw output that caused the error.
                     # The ModelBehaviorError has arguments (json_str, type_adapter) but doesn't store json_str directly.
                     # The string representation of e includes it, but it's better if we can extract it more cleanly.
@@ -132,7 +272,7 @@ async def autonomous_chat(job: Job, max_turns: int = 15) -> None:
                             if error_details and isinstance(error_details, list) and error_details[0].get('input_value'):
                                 raw_llm_output = str(error_details[0]['input_value'])
                         except Exception as ex_extract:
-                            logger.warning(f"Job {job.job_id}: Could not extract input_value from ModelBehaviorError: {ex_extract}")
+                            logger.warning("Job %s: Could not extract input_value from ModelBehaviorError: %s", job.job_id, ex_extract)
                     
                     current_user_message_content = prompt_strategy.get_format_correction_prompt(
                         agent_name=job.agent.name,
@@ -141,15 +281,19 @@ async def autonomous_chat(job: Job, max_turns: int = 15) -> None:
                         raw_llm_output=raw_llm_output, # Pass the raw output if available
                         error_details=str(e) # Full error string for context
                     )
-                    logger.info(f"Job {job.job_id}: Sending correction prompt to agent due to formatting error.")
+                    logger.info("Job %s: Sending correction prompt to agent due to formatting error.", job.job_id)
                     # Add the error and correction attempt to chat history for context
+                    _checkpoint()
                     job.chat_history.append({"role": "system", "content": f"Error during previous turn: {e}. Attempting to correct."})
                     continue # Continue to the next iteration of the loop with the corrective prompt
             except Exception as e:
-                logger.error(f"Job {job.job_id}: Error during turn {check}: {e}", exc_info=True)
+                _drop_pending(current_conversation_history, turn_message)
+                _checkpoint()
+                logger.error("Job %s: Error during turn %s: %s", job.job_id, check, e, exc_info=True)
                 current_user_message_content = f"The last attempt failed with an error: {e}. Please review the situation, check your plan, and try to recover and continue the task."
         
-        logger.info(f"Job {job.job_id}: Max turns ({max_turns}) reached. Current history saved. Job status: '{job.status}'.")
+        _checkpoint()
+        logger.info("Job %s: Max turns (%s) reached. Current history saved. Job status: '%s'.", job.job_id, max_turns, job.status)
     return
 
 async def user_chat(mcp_agent: "MCPAgent"):
@@ -165,7 +309,6 @@ async def user_chat(mcp_agent: "MCPAgent"):
         mcp_agent (MCPAgent): The MCPAgent instance to chat with. This function will
             specifically use the `mcp_agent.interactive_agent` for the session.
     """
-    enable_verbose_stdout_logging()
     history: List[Dict[str, str]] = []
 
     # The interactive agent is what we want to use here. It's an attribute of the MCPAgent.
@@ -179,29 +322,33 @@ async def user_chat(mcp_agent: "MCPAgent"):
         while True:
             try:
                 # The prompt should show the main agent name (the MCPAgent's name).
-                user_text = await loop.run_in_executor(None, input, f"{getattr(mcp_agent, 'name', 'Agent')} You: ")
+                user_text = await loop.run_in_executor(_INPUT_EXECUTOR, input, f"{getattr(mcp_agent, 'name', 'Agent')} You: ")
                 user_text = user_text.strip()
             except (EOFError, KeyboardInterrupt):
                 logger.debug("User interrupted input via EOF/KeyboardInterrupt.")
                 user_text = "/exit"
 
-            if user_text.lower() in {"/exit", "/quit", "exit", "quit"}:
+            if not user_text:
+                continue  # nothing typed, don't spend a model round-trip on it
+            if user_text.lower() in _EXIT_COMMANDS:
                 logger.info("Exiting user chat session.")
                 return
             
             async with spinner(f"{getattr(mcp_agent, 'name', 'Agent')} thinking..."): # spinner from chat_utils
-                turn_input = history + [{"role": "user", "content": user_text}]
+                # Appended in place; on success the history is replaced by the run's input list,
+                # on error the user message stays and the error reply is added after it
+                history.append({"role": _USER_ROLE, "content": user_text})
                 
                 try:
-                    result = await Runner.run(starting_agent=chat_agent, input=turn_input, max_turns=10)
+                    result = await Runner.run(starting_agent=chat_agent, input=history, max_turns=10)
                     
                     final_output_data = result.final_output
-                    history = result.to_input_list()
+                    history = _merge_history(history, result)
                     
                     # Prefer 'assistant_reply' if present
                     assistant_reply_content = getattr(final_output_data, 'assistant_reply', None)
                     
-                    logger.info(f"Assistant raw output: {final_output_data}")
+                    logger.info("Assistant raw output: %s", final_output_data)
                     if assistant_reply_content:
                         print(f"Assistant: {assistant_reply_content}")
                     else:
@@ -209,76 +356,100 @@ async def user_chat(mcp_agent: "MCPAgent"):
                         print(f"Assistant: {final_output_data}")
                         
                 except ModelBehaviorError as e:
-                    logger.error(f"ModelBehaviorError during interactive turn: {e}", exc_info=True)
+                    logger.error("ModelBehaviorError during interactive turn: %s", e, exc_info=True)
                     error_message = f"I encountered a formatting error: {e}. Let me try again."
                     print(f"Assistant: {error_message}")
                     
                     # Add the error to history and continue
-                    history.append({"role": "user", "content": user_text})
                     history.append({"role": "assistant", "content": error_message})
                     
                 except Exception as e:
-                    logger.error(f"Error during interactive turn: {e}", exc_info=True)
+                    logger.error("Error during interactive turn: %s", e, exc_info=True)
                     error_message = f"I encountered an error: {e}. Please try again or rephrase your request."
                     print(f"Assistant: {error_message}")
                     
                     # Add the error to history and continue the conversation
-                    history.append({"role": "user", "content": user_text})
                     history.append({"role": "assistant", "content": error_message})
 
-async def chat_worker(queue: "asyncio.Queue[Job]") -> None:
+async def chat_worker(queue: "asyncio.PriorityQueue") -> None:
     """A worker that processes jobs from an asyncio queue.
 
     Continuously fetches jobs, checks dependencies, and executes them using `autonomous_chat`.
 
     Args:
-        queue (asyncio.Queue[Job]): The queue from which to fetch jobs.
+        queue (asyncio.PriorityQueue): The queue from which to fetch jobs.
     """
     while True:
-        job = await queue.get()
-        logger.info(f"Chat worker picked up job {job.job_id} for agent {getattr(job.agent, 'name', 'UnnamedAgent')}.")
-
-        # Check dependencies - get_done_jobs is from job_manager
-        DONE_JOBS = get_done_jobs()
-        unmet_dependencies = [dep_id for dep_id in job.depends_on if dep_id not in DONE_JOBS]
-
-        if unmet_dependencies:
-            logger.info(f"Job {job.job_id} has unmet dependencies: {unmet_dependencies}. Requeuing with 30s delay.")
-            async def requeue_with_delay(current_job, delay_seconds, job_queue):
-                await asyncio.sleep(delay_seconds)
-                await job_queue.put(current_job)
-                logger.info(f"Job {current_job.job_id} requeued after delay.")
-            # It's important not to modify job status here, it's still 'in_queue' effectively
-            asyncio.create_task(requeue_with_delay(job, 30, queue))
+        _, _, job = await queue.get()  # ready jobs (fewest unmet dependencies) come first
+        logger.info("Chat worker picked up job %s for agent %s.", job.job_id, getattr(job.agent, 'name', 'UnnamedAgent'))
+
+        # Check dependencies against the status index instead of scanning every job.
+        # It's important not to modify job status here, it's still 'in_queue' effectively.
+        # The worker moves on; the job comes back as soon as its dependencies finish.
+        if _wait_for_dependencies(job, queue):
             queue.task_done() # Signal that this attempt to process the job is done (for now)
             continue
+
+        # An agent at its limit doesn't hold up the worker: the job is set aside and
+        # requeued when one of that agent's running jobs ends
+        agent_name = getattr(job.agent, 'name', 'UnnamedAgent')
+        if _running_per_agent[agent_name] >= MAX_JOBS_PER_AGENT:
+            logger.info("Agent %s is running %s jobs already; job %s waits for one to end.", agent_name, MAX_JOBS_PER_AGENT, job.job_id)
+            _deferred_per_agent[agent_name].append(job)
+            queue.task_done()
+            continue
         
         try:
-            job.status = 'in_progress'
-            logger.info(f"Job {job.job_id} status set to 'in_progress'. Starting autonomous_chat.")
+            set_job_status(job, 'in_progress')
+            logger.info("Job %s status set to 'in_progress'. Starting autonomous_chat.", job.job_id)
             
             # get_chat_strategy is from strategies module
             # autonomous_chat now takes the job object directly
-            await autonomous_chat(job=job, max_turns=30)
+            _running_per_agent[agent_name] += 1
+            try:
+                await autonomous_chat(job=job, max_turns=30)
+            finally:
+                _running_per_agent[agent_name] -= 1
+                deferred = _deferred_per_agent[agent_name]
+                if deferred:
+                    await enqueue_job(queue, deferred.popleft())
             
             # autonomous_chat is responsible for setting job.status to 'done' or leaving it as 'in_progress' (or 'error')
             if job.status == 'in_progress':
-                logger.info(f"Job {job.job_id} finished autonomous_chat (e.g. max_turns reached), status remains 'in_progress'. Will be picked up if explicitly requeued by a mechanism.")
+                logger.info("Job %s finished autonomous_chat (e.g. max_turns reached), status remains 'in_progress'. Will be picked up if explicitly requeued by a mechanism.", job.job_id)
             elif job.status == 'done':
-                logger.info(f"Job {job.job_id} completed and marked as 'done' by autonomous_chat.")
-            elif job.status == 'in_queue': # If a tool inside autonomous_chat re-queued it (e.g. _start_and_wait)
-                 logger.info(f"Job {job.job_id} was explicitly moved back to 'in_queue' status during its run.")
+                logger.info("Job %s completed and marked as 'done' by autonomous_chat.", job.job_id)
+            elif job.status == 'in_queue': # A tool inside autonomous_chat made it wait (e.g. _start_and_wait)
+                logger.info("Job %s was explicitly moved back to 'in_queue' status during its run.", job.job_id)
+                # Requeued only now that its run is over, so it can't be picked up while still running
+                if not _wait_for_dependencies(job, queue):
+                    await enqueue_job(queue, job)
             else:
-                logger.info(f"Job {job.job_id} finished autonomous_chat with status: '{job.status}'.")
+                logger.info("Job %s finished autonomous_chat with status: '%s'.", job.job_id, job.status)
 
         except Exception as e:
-            job.status = 'error'
+            set_job_status(job, 'error')
             job.summary = (job.summary or "") + f" Error in chat_worker: {e}" # Append error to summary
-            logger.error(f"Job {job.job_id} failed with exception in chat_worker: {e}", exc_info=True)
+            logger.error("Job %s failed with exception in chat_worker: %s", job.job_id, e, exc_info=True)
         finally:
             # Ensure JOBS reflects the final state of the job, especially if autonomous_chat modified it.
             # from .job_manager import JOBS # Not ideal here due to potential for repeated imports
             # JOBS[job.job_id] = job # This should be handled by functions that modify job, or by autonomous_chat itself.
             # The job object is mutable, so changes within autonomous_chat to job.status etc. are already reflected.
-            logger.info(f"Chat worker finished processing job {job.job_id}. Final status: '{job.status}'.")
-            queue.task_done() 
\ No newline at end of file
+            logger.info("Chat worker finished processing job %s. Final status: '%s'.", job.job_id, job.status)
+            queue.task_done() 
+
+def start_workers(queue: "asyncio.PriorityQueue", n: int = 4, loop: Optional[asyncio.AbstractEventLoop] = None) -> List["asyncio.Task[None]"]:
+    """Starts `n` chat workers sharing `queue`, so independent jobs run concurrently.
+
+    Args:
+        queue (asyncio.PriorityQueue): The queue the workers fetch jobs from.
+        n (int, optional): Number of workers. Defaults to 4.
+        loop (asyncio.AbstractEventLoop, optional): Loop to create the tasks on; the
+            current event loop is used when omitted (it doesn't need to be running yet).
+
+    Returns:
+        List[asyncio.Task[None]]: The worker tasks.
+    """
+    loop = loop or asyncio.get_event_loop()
+    return [loop.create_task(chat_worker(queue)) for _ in range(n)]
@@ -1,14 +1,28 @@
 #!/usr/bin/env python3
-import sys, subprocess, time
+import sys, socket, subprocess, time
 import requests
 
+SERVER_HOST, SERVER_PORT = "127.0.0.1", 9000
+# Total time to wait for a freshly started server to accept connections
+STARTUP_TIMEOUT = 20
+# Reused for every request, so the POST after the health check shares its connection
+_SESSION = requests.Session()
+
+def _server_up() -> bool:
+    """Returns True if something accepts TCP connections on the server port."""
+    try:
+        socket.create_connection((SERVER_HOST, SERVER_PORT), timeout=0.1).close()
+        return True
+    except OSError:
+        return False
+
 def ensure_server(agent, prompt):
     """Ensures that the main FastAPI server is running, starting it if necessary.
 
-    It first attempts a health check to "http://127.0.0.1:9000/".
-    If the server is not reachable (ConnectionError), it tries to start
-    the main application (`run_agent -v --log`) as a background process.
-    It then waits and retries the health check for up to 20 seconds.
+    It first checks whether "127.0.0.1:9000" accepts connections.
+    If not, it tries to start the main application (`run_agent -v --log`) as a
+    background process, then polls with exponential backoff (25 ms doubling up
+    to 1 s) for up to 20 seconds, so a server that comes up quickly is noticed quickly.
 
     Note: The `agent` and `prompt` arguments are not currently used by this function
     but are kept for potential future use or to maintain a consistent signature
@@ -21,23 +35,19 @@ def ensure_server(agent, prompt):
     Returns:
         bool: True if the server is running or successfully started, False otherwise.
     """
-    # health‐check any endpoint
-    try:
-        requests.get("http://127.0.0.1:9000/")
+    if _server_up():
         return True
-    except requests.exceptions.ConnectionError:
-        # not up → start main.py in background
-        subprocess.Popen(["run_agent", "-v", "--log"])
-        # wait for server to spin up
-        for i in range(20):
-            time.sleep(1)
-            try:
-                requests.get("http://127.0.0.1:9000/")
-                return True
-            except:
-                continue
-        print("Failed to start main.py HTTP server.")
-        return False
+    # not up → start main.py in background
+    subprocess.Popen(["run_agent", "-v", "--log"])
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    delay = 0.025
+    while time.monotonic() < deadline:
+        time.sleep(delay)
+        if _server_up():
+            return True
+        delay = min(delay * 2, 1.0)
+    print("Failed to start main.py HTTP server.")
+    return False
 
 def trigger(agent, prompt):
     """Triggers a specific agent on the running FastAPI server via an HTTP POST request.
@@ -52,8 +62,8 @@ def trigger(agent, prompt):
     Raises:
         requests.exceptions.HTTPError: If the server returns an error status code.
     """
-    url = f"http://127.0.0.1:9000/{agent}/run"
-    resp = requests.post(url, json={"prompt": prompt})
+    url = f"http://{SERVER_HOST}:{SERVER_PORT}/{agent}/run"
+    resp = _SESSION.post(url, json={"prompt": prompt})
     resp.raise_for_status()
     print(resp.json())
 
@@ -64,5 +74,5 @@ if __name__ == "__main__":
 
     agent  = sys.argv[1]
     prompt = " ".join(sys.argv[2:]) if len(sys.argv) > 2 else ""
-    ensure_server()
+    ensure_server(agent, prompt)
     trigger(agent, prompt)
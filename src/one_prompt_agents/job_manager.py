@@ -4,17 +4,27 @@ This module is responsible for managing jobs within the one-prompt-agents framew
 A 'job' represents a specific task or conversation to be handled by an agent.
 This includes:
 - The `Job` dataclass: Defines the structure of a job (ID, agent, input text, status, etc.).
-- `JOBS`: A global dictionary that acts as a registry for all active jobs, keyed by job ID.
-- `get_done_jobs()`: Returns IDs of all completed jobs.
+- `JOBS`: A global ordered dictionary that acts as a registry for jobs, keyed by job ID.
+  It holds at most `MAX_JOBS` jobs; past that the oldest finished jobs are dropped.
+- `set_job_status()`: Changes a job's status and keeps the per-status ID index current;
+  all status changes go through it.
+- `is_job_finished()`: Checks that index for a job that ended in 'done' or 'error'.
 - `get_job()`: Retrieves a specific job by its ID.
 - `submit_job()`: Creates a new job, adds it to the `JOBS` registry, and puts it onto an
   asyncio queue for processing by a chat worker.
+- `enqueue_job()`: Puts a job on the job queue, an `asyncio.PriorityQueue` ordered so
+  that jobs with fewer unfinished dependencies are picked up first.
+- `get_cached_plan()` / `cache_plan()`: A small LRU cache of the final plans of completed
+  jobs, keyed by the job fingerprint, so a repeated job can reuse its previous plan.
 
 The `JOBS` dictionary here is the central source of truth for job states, though strategies
 and other components access job information via the `get_job` function to maintain decoupling.
 """
 import asyncio
+import hashlib
+import itertools
 import uuid
+from collections import OrderedDict, defaultdict
 from dataclasses import dataclass, field
 from typing import Any, List, Dict, Set, Optional
 import logging
@@ -37,6 +47,10 @@ class Job:
         status (str): Current status of the job (e.g., 'in_draft', 'in_queue', 'in_progress', 'done', 'error').
         chat_history (List[Dict[str, str]]): The conversation history for this job.
         summary (str | None): An optional summary of the job's outcome or progress.
+        done_event (asyncio.Event): Set once the job finishes ('done' or 'error'), so
+            dependents can await it instead of polling `JOBS` and never hang on a failed job.
+        fingerprint (str): Hash of the agent name and instructions, strategy name and job
+            text; identical jobs share it (see `PLAN_CACHE`).
     """
     job_id: str
     agent: Any
@@ -46,23 +60,104 @@ class Job:
     status: str = 'in_draft'  # 'in_draft', 'in_queue', 'in_progress', 'done', 'error'
     chat_history: List[Dict[str, str]] = field(default_factory=list)
     summary: str | None = ""
+    done_event: asyncio.Event = field(default_factory=asyncio.Event, repr=False, compare=False)
+    fingerprint: str = ""
 
-# Global dict to track all jobs
-JOBS: Dict[str, Job] = {}
+# Upper bound on the jobs kept in JOBS; past it the oldest finished jobs, chat histories
+# included, are dropped so a long-running server doesn't grow without bound
+MAX_JOBS = 10_000
+FINISHED_STATUSES: frozenset[str] = frozenset({"done", "error"})
+# Global dict to track all jobs, oldest first
+JOBS: "OrderedDict[str, Job]" = OrderedDict()
+# Job IDs by status, maintained by set_job_status. Finished IDs stay indexed after their
+# job is dropped from JOBS, so dependents still see them as finished.
+_JOBS_BY_STATUS: Dict[str, Set[str]] = defaultdict(set)
+DONE_JOBS: Set[str] = _JOBS_BY_STATUS['done']
+# Tie-breaker for queue entries: FIFO among jobs with the same number of unmet dependencies
+_enqueue_seq = itertools.count()
+# Final plans of completed jobs by job fingerprint, least recently used first
+PLAN_CACHE: "OrderedDict[str, Any]" = OrderedDict()
+PLAN_CACHE_SIZE = 100
 
-def get_done_jobs() -> Set[str]:
-    """Returns a set of job IDs for all jobs that have a 'done' status."""
-    return {job_id for job_id, job in JOBS.items() if job.status == 'done'}
+def job_fingerprint(agent_name: str, strategy_name: str, text: str, instructions: str = "") -> str:
+    """Returns the key under which jobs with the same agent, strategy and text share a plan.
+
+    The agent's instructions are part of the key, so editing an agent's prompt invalidates
+    the plans cached under the old one.
+    """
+    return hashlib.sha256(f"{agent_name}|{strategy_name}|{instructions}|{text}".encode()).hexdigest()
+
+def get_cached_plan(fingerprint: str) -> Optional[List[Any]]:
+    """Returns a copy of the plan cached for `fingerprint` with every step unchecked, or None.
+
+    Cached plans come from completed jobs, so all their steps are checked; handed back as-is
+    they would let the plan-based strategies end the new job before it did any work.
+    """
+    plan = PLAN_CACHE.get(fingerprint)
+    if plan is None:
+        return None
+    PLAN_CACHE.move_to_end(fingerprint)
+    return [{**step, "checked": False} if isinstance(step, dict) else step for step in plan]
+
+def cache_plan(fingerprint: str, plan: Any) -> None:
+    """Caches the final plan of a completed job, evicting the least recently used one when full."""
+    PLAN_CACHE[fingerprint] = plan
+    PLAN_CACHE.move_to_end(fingerprint)
+    if len(PLAN_CACHE) > PLAN_CACHE_SIZE:
+        PLAN_CACHE.popitem(last=False)
+
+def set_job_status(job: Job, new_status: str) -> None:
+    """Sets a job's status, updating the status index; finishing a job wakes its dependents."""
+    _JOBS_BY_STATUS[job.status].discard(job.job_id)
+    _JOBS_BY_STATUS[new_status].add(job.job_id)
+    job.status = new_status
+    if new_status in FINISHED_STATUSES:
+        job.done_event.set()
+
+def mark_job_done(job: Job) -> None:
+    """Sets a job's status to 'done', records it in `DONE_JOBS` and wakes its dependents."""
+    set_job_status(job, 'done')
+
+def is_job_finished(job_id: str) -> bool:
+    """Returns True if the job ended in 'done' or 'error', even if it was since dropped from JOBS."""
+    return job_id in DONE_JOBS or job_id in _JOBS_BY_STATUS['error']
+
+def add_job(job: Job) -> None:
+    """Registers a job in JOBS and the status index, dropping the oldest finished jobs past `MAX_JOBS`."""
+    JOBS[job.job_id] = job
+    _JOBS_BY_STATUS[job.status].add(job.job_id)
+    excess = len(JOBS) - MAX_JOBS
+    if excess > 0:
+        # Unfinished jobs are never dropped; the scan stops as soon as enough are found
+        finished = (job_id for job_id, j in JOBS.items() if j.status in FINISHED_STATUSES)
+        for job_id in list(itertools.islice(finished, excess)):
+            del JOBS[job_id]
 
 def get_job(job_id: str) -> Optional[Job]:
     """Retrieve a job by its ID from the global JOBS dictionary."""
     return JOBS.get(job_id)
 
-async def submit_job(queue: "asyncio.Queue[Job]", agent: Any, text: str, strategy_name: str, depends_on: Optional[List[str]] = None) -> str:
+def count_unmet_dependencies(job: Job) -> int:
+    """Returns how many of the job's dependencies have not finished yet."""
+    return sum(1 for dep_id in job.depends_on if not is_job_finished(dep_id))
+
+async def enqueue_job(queue: "asyncio.PriorityQueue", job: Job) -> None:
+    """Puts a job on the priority job queue; ready jobs sort ahead of waiting ones.
+
+    Entries are `(unmet_dependencies, sequence, job)` tuples, and workers unpack them with
+    `_, _, job = await queue.get()`.
+
+    The queue must stay unbounded: jobs are also enqueued from tool calls running inside
+    workers, so a full queue would leave those workers blocked on a put that only they
+    could make room for. Each put wakes at most one idle worker.
+    """
+    queue.put_nowait((count_unmet_dependencies(job), next(_enqueue_seq), job))
+
+async def submit_job(queue: "asyncio.PriorityQueue", agent: Any, text: str, strategy_name: str, depends_on: Optional[List[str]] = None) -> str:
     """Creates a new job, adds it to the global JOBS dictionary, and puts it on the processing queue.
 
     Args:
-        queue (asyncio.Queue[Job]): The queue to add the job to.
+        queue (asyncio.PriorityQueue): The job queue to add the job to (see `enqueue_job`).
         agent: The agent instance for the job.
         text (str): The input text/prompt for the job.
         strategy_name (str): The name of the chat strategy to use.
@@ -72,8 +167,11 @@ async def submit_job(queue: "asyncio.Queue[Job]", agent: Any, text: str, strateg
         str: The ID of the newly created and submitted job.
     """
     job_id = str(uuid.uuid4())[-6:]  # Shortened job_id to last 6 characters
-    job = Job(job_id=job_id, agent=agent, text=text, strategy_name=strategy_name, depends_on=depends_on or [], status='in_queue')
-    JOBS[job_id] = job
-    await queue.put(job)
+    instructions = getattr(agent, 'instructions', None)
+    fingerprint = job_fingerprint(getattr(agent, 'name', ''), strategy_name, text,
+                                  instructions if isinstance(instructions, str) else "")
+    job = Job(job_id=job_id, agent=agent, text=text, strategy_name=strategy_name, depends_on=depends_on or [], status='in_queue', fingerprint=fingerprint)
+    add_job(job)
+    await enqueue_job(queue, job)
     logger.info(f"Job {job_id} submitted to queue for agent {getattr(agent, 'name', 'UnnamedAgent')}.")
     return job_id 
\ No newline at end of file
@@ -1,6 +1,8 @@
 # logging_setup.py
 from __future__ import annotations
-import logging, sys
+import atexit
+import functools
+import logging, logging.handlers, queue, sys
 from pathlib import Path
 from datetime import datetime
 from typing import Final, Optional
@@ -22,6 +24,7 @@ class StreamToLogger(io.TextIOBase):
         _logger (logging.Logger): The logger instance to which messages are sent.
         _level (int): The logging level for messages (e.g., `logging.INFO`).
         _buf (str): A buffer to accumulate partial lines before logging.
+        _log (Callable[[str], None]): Logs one line at `_level`, resolved once.
     """
     def __init__(self, target_stream: io.TextIOBase,
                  logger: logging.Logger, level: int):
@@ -36,6 +39,15 @@ class StreamToLogger(io.TextIOBase):
         self._logger = logger
         self._level  = level
         self._buf    = ""
+        # Bound once instead of looked up on every captured line
+        self._write  = target_stream.write
+        self._flush  = target_stream.flush
+        if level == logging.INFO:
+            self._log = logger.info
+        elif level == logging.ERROR:
+            self._log = logger.error
+        else:
+            self._log = functools.partial(logger.log, level)
 
     # -------- required write/flush --------
     def write(self, s: str) -> int:
@@ -50,14 +62,21 @@ class StreamToLogger(io.TextIOBase):
         Returns:
             int: The number of characters written (from `_stream.write`).
         """
-        n = self._stream.write(s)        # keep console output
-        self._stream.flush()
-
-        self._buf += s
-        while "\n" in self._buf:
-            line, self._buf = self._buf.split("\n", 1)
+        n = self._write(s)               # keep console output
+        self._flush()
+
+        # the logger would drop these lines anyway; checked per write (logging caches the
+        # answer until a level changes), so setLevel after creation is honoured
+        if not self._logger.isEnabledFor(self._level):
+            return n
+        if "\n" not in s:               # partial line, nothing to log yet
+            self._buf += s
+            return n
+        # One split over the whole write; the last piece is the next partial line
+        *lines, self._buf = (self._buf + s).split("\n")
+        for line in lines:
             if line:
-                self._logger.log(self._level, line)
+                self._log(line)
         return n                         # returning an int matters!
 
     def flush(self) -> None:
@@ -67,9 +86,9 @@ class StreamToLogger(io.TextIOBase):
         Then, the original `_stream` is flushed.
         """
         if self._buf:
-            self._logger.log(self._level, self._buf.rstrip())
+            self._log(self._buf.rstrip())
             self._buf = ""
-        self._stream.flush()
+        self._flush()
 
     # -------- proxy everything else --------
     def __getattr__(self, name):
@@ -92,6 +111,20 @@ LOG_DIR: Final = Path("logs")               # ➊ where logs live
 LOG_FORMAT: Final = "%(asctime)s %(levelname)-8s [%(name)s] %(message)s"
 DATE_FORMAT:  Final = "%Y-%m-%d %H:%M:%S"
 
+# enable_verbose_stdout_logging() adds a new handler on every call, so it's done only once
+_verbose_sdk_logging_enabled = False
+# Background thread that runs the real handlers; replaced on every setup_logging call
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def stop_log_listener() -> None:
+    """Stops the log listener thread, writing out any records still queued."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+atexit.register(stop_log_listener)
+
 
 
 def setup_logging(log_to_file: bool = True, level: int = logging.INFO, capture_stdio: bool = False) -> Optional[Path]:
@@ -99,10 +132,13 @@ def setup_logging(log_to_file: bool = True, level: int = logging.INFO, capture_s
 
     This function sets up logging with a console handler (writing to `stderr`).
     If `log_to_file` is True (default), it also sets up a file handler writing to a 
-    timestamped log file in the `LOG_DIR`.
+    timestamped log file in the `LOG_DIR`. The root logger only puts records on a queue;
+    a `QueueListener` thread runs these handlers, so log I/O never blocks the event loop.
     It uses a predefined `LOG_FORMAT` and `DATE_FORMAT`.
     The overall logging level is set by the `level` argument.
 
+    The agents SDK's verbose stdout logging is enabled the first time this is called.
+
     If `capture_stdio` is True, it replaces `sys.stdout` and `sys.stderr` with
     `StreamToLogger` instances, causing their output to be logged by the root logger
     at INFO and ERROR levels, respectively.
@@ -136,12 +172,28 @@ def setup_logging(log_to_file: bool = True, level: int = logging.INFO, capture_s
     console_handler.setLevel(level) 
     handlers.append(console_handler)
 
+    global _listener
+    stop_log_listener()
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # Only merges args (and traceback) into the message; the real handlers add the format
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
     logging.basicConfig(
         level=level, # Use the passed level
-        handlers=handlers,
-        force=True # clobber any earlier basicConfig()
+        handlers=[queue_handler],
+        force=True # clobber any earlier basicConfig(), so repeated calls don't stack handlers
     )
 
+    global _verbose_sdk_logging_enabled
+    if not _verbose_sdk_logging_enabled:
+        # Before capture_stdio, so the SDK's handler writes to the real stdout
+        from agents import enable_verbose_stdout_logging
+        enable_verbose_stdout_logging()
+        _verbose_sdk_logging_enabled = True
+
     if capture_stdio:
         root = logging.getLogger()
         sys.stdout = StreamToLogger(sys.__stdout__, root, logging.INFO) # Or use level?
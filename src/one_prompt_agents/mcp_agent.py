@@ -2,28 +2,101 @@
 # File: mcp_agent.py
 # ---------------------------------------------------------------------------------------------------
 import asyncio
+import functools
+import os
+import socket
+import uvicorn
 from fastmcp import FastMCP
-from agents.mcp import MCPServerStdio, MCPServerSse
-from agents import Agent, Runner, trace, enable_verbose_stdout_logging, RunHooks, WebSearchTool, FileSearchTool
+from agents.mcp import MCPServerSse
+from agents import Agent, WebSearchTool, FileSearchTool
 from typing import Any, List
 from one_prompt_agents.utils import uvicorn_log_level
-from one_prompt_agents.job_manager import submit_job, get_job
+from one_prompt_agents.chat_utils import cleanup_mcp_server
+from one_prompt_agents.job_manager import submit_job, get_job, set_job_status
 from pydantic import BaseModel
-from one_prompt_agents.strategies import get_chat_strategy  # local import to avoid cycles
+from one_prompt_agents.strategies import get_output_type  # local import to avoid cycles
 
 import logging
 logger = logging.getLogger(__name__) 
 
-next_port = 8000
+# One FastMCP SSE server exposes the tools of every MCPAgent; each MCPAgent is a client of
+# it that only lists its own agent's tools (see `MCPAgent.list_tools`)
+AGENT_MCP = FastMCP(
+    name="agents_mcp",
+    version='0.2.0',
+    description="This MCP allows to call the loaded agents.",
+)
+AGENT_MCP_HOST = '127.0.0.1'
+# Port the shared server is bound to; set by `start_agent_mcp_server`
+_agent_mcp_port: "int | None" = None
+
+def _agent_mcp_url() -> str:
+    """Returns the SSE URL of the shared agents MCP server.
+
+    Raises:
+        RuntimeError: If `start_agent_mcp_server` has not been called yet.
+    """
+    if _agent_mcp_port is None:
+        raise RuntimeError("The agents MCP server has not been started")
+    return f"http://{AGENT_MCP_HOST}:{_agent_mcp_port}/sse"
+
+async def _serve(server: uvicorn.Server, sock: socket.socket):
+    """Runs `server` on the already bound `sock`, closing it even if serving never starts."""
+    try:
+        await server.serve(sockets=[sock])
+    finally:
+        sock.close()
+
+def start_agent_mcp_server() -> asyncio.Task:
+    """Starts the shared agents MCP server as an asynchronous task.
+
+    The socket is bound here, on `AGENT_MCP_PORT` or a free port when it is unset, and
+    handed to uvicorn, so the port agents connect to is the one actually being served.
+
+    Returns:
+        asyncio.Task: The task representing the running MCP server.
+    """
+    global _agent_mcp_port
+    sock = socket.socket()
+    try:
+        sock.bind((AGENT_MCP_HOST, int(os.getenv("AGENT_MCP_PORT", "0"))))
+    except OSError:
+        sock.close()
+        raise
+    _agent_mcp_port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(AGENT_MCP.sse_app(), log_level=uvicorn_log_level()))
+    loop = asyncio.get_event_loop()
+    task = loop.create_task(_serve(server, sock))
+    logger.info("Agents MCP server starting on %s:%s", AGENT_MCP_HOST, _agent_mcp_port)
+    return task
+
+@functools.lru_cache(maxsize=None)
+def _read_prompt(path: str, mtime_ns: int) -> str:
+    """Reads a prompt file; cached per modification time, so edits are picked up on reload."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def _load_prompt(path: str) -> str:
+    """Returns the contents of a prompt file, reading it only if it changed since the last load."""
+    return _read_prompt(path, os.stat(path).st_mtime_ns)
+
+# Built-in SDK tools that can be enabled per agent via `tools_config`
+TOOL_CLASSES = {
+    "WebSearchTool": WebSearchTool,
+    "FileSearchTool": FileSearchTool,
+    # Add other supported tools here
+}
 
 class InteractiveReply(BaseModel):
     assistant_reply: str
 
 class MCPAgent(MCPServerSse):
-    """Represents an agent that is also an MCP SSE (Server-Sent Events) server.
+    """Represents an agent that is also exposed as MCP SSE (Server-Sent Events) tools.
 
-    This class encapsulates an `Agent` and exposes it as a tool through a `FastMCP`
-    server. It allows other agents or systems to interact with this agent via SSE.
+    This class encapsulates an `Agent` and exposes it as tools on the shared `AGENT_MCP`
+    server, which `start_agent_mcp_server` runs once for all agents. As an
+    `MCPServerSse` client of that server it only lists this agent's own tools, so other
+    agents or systems can interact with this agent via SSE.
     It manages a job queue for processing requests and can interact with other MCP servers.
 
     Each MCPAgent instance holds two underlying `agents.Agent` instances:
@@ -35,7 +108,7 @@ class MCPAgent(MCPServerSse):
         for direct user chats.
 
     Attributes:
-        url (str): The SSE URL where this MCPAgent is listening.
+        url (str): The SSE URL of the shared agents MCP server.
         job_queue (asyncio.Queue): The queue used to submit jobs to this agent.
         mcp_servers (List[Any]): A list of other MCP servers this agent can interact with.
         prompt_file (str): Path to the file containing the agent's instructions.
@@ -44,8 +117,6 @@ class MCPAgent(MCPServerSse):
         strategy_name (str): The name of the chat strategy for jobs processed by this agent.
         agent (Agent): The underlying `agents.Agent` instance for autonomous operation.
         interactive_agent (Agent): The agent instance for interactive REPL sessions.
-        mcp (FastMCP): The `FastMCP` server instance that exposes this agent as tools.
-        mcp_task (asyncio.Task): The asyncio task running the `FastMCP` server.
     """
     def __init__(
         self,
@@ -74,12 +145,9 @@ class MCPAgent(MCPServerSse):
                                            Keys are tool names (str), values are parameter dicts or None.
                                            Defaults to None (no tools).
         """
-        global next_port
-        next_port += 1
-        self.url = f"http://127.0.0.1:{next_port}/sse"
         super().__init__(
             params={
-                'url': self.url,
+                'url': '',  # filled in by connect(), once the shared server is bound
                 'timeout': 8,
                 'sse_read_timeout': 100
             },
@@ -91,28 +159,20 @@ class MCPAgent(MCPServerSse):
         self.mcp_servers = mcp_servers
         self.prompt_file = prompt_file
         # Make sure the return_type satisfies the requirements of the chosen prompt strategy
-        strategy_cls = get_chat_strategy(strategy_name)
-        augmented_return_type = strategy_cls.ensure_return_type(return_type)
+        augmented_return_type = get_output_type(strategy_name, return_type)
         self.return_type = augmented_return_type
         self.inputs_description = inputs_description
         self.strategy_name = strategy_name
 
-        with open(prompt_file, 'r', encoding='utf-8') as f:
-            instructions = f.read()
+        instructions = _load_prompt(prompt_file)
 
         agent_tools = []
         if tools_config:
             logger.info(f"Configuring tools for agent {name} based on tools_config: {tools_config}")
-            tool_mapping = {
-                "WebSearchTool": WebSearchTool,
-                "FileSearchTool": FileSearchTool,
-                # Add other supported tools here
-            }
-
             for tool_name, params in tools_config.items():
                 logger.info(f"Attempting to add tool: {tool_name} with params: {params}")
-                if tool_name in tool_mapping:
-                    ToolClass = tool_mapping[tool_name]
+                if tool_name in TOOL_CLASSES:
+                    ToolClass = TOOL_CLASSES[tool_name]
                     try:
                         if params and isinstance(params, dict):
                             agent_tools.append(ToolClass(**params))
@@ -144,38 +204,38 @@ class MCPAgent(MCPServerSse):
             tools=agent_tools,
         )
 
-        # FastMCP server to expose this agent as a tool
-        self.mcp = FastMCP(
-            name=f"{name}_mcp",
-            version='0.2.0',
-            description=f"This MCP allows to call the {name} agent.",
-        )
-        self.mcp.add_tool(
+        # Expose this agent as tools on the shared agents MCP server
+        self._tool_names = frozenset({f"start_agent_{name}", f"_start_and_wait_{name}", f"get_agent_info_{name}"})
+        AGENT_MCP.add_tool(
             name=f"start_agent_{name}",
             description=f"Starts the {name} agent async. No wait for it's response.",
-            fn=lambda inputs: self._start(inputs)
+            fn=self._start
         )
-        self.mcp.add_tool(
+        AGENT_MCP.add_tool(
             name=f"_start_and_wait_{name}",
             description=f"Starts a new job for the agent {name} and waits until it\'s finished.",
             fn=self._start_and_wait
         )
-        self.mcp.add_tool(
+        AGENT_MCP.add_tool(
             name=f"get_agent_info_{name}",
             description=f"This method returns further information about the agent {self.agent.name}. This agent description: {self.inputs_description}",
             fn=self._get_agent_info
         )
 
+    @property
+    def url(self) -> str:
+        """SSE URL of the shared agents MCP server this agent's tools are served on."""
+        return _agent_mcp_url()
 
-        # Start FastMCP SSE for other agents to call
-        loop = asyncio.get_event_loop()
-        self.mcp_task = loop.create_task(
-            self.mcp.run_sse_async(
-                host='127.0.0.1',
-                port=next_port,
-                log_level=uvicorn_log_level(),
-            )
-        )
+    async def connect(self):
+        """Connects to the shared agents MCP server, resolving its URL at connect time."""
+        self.params['url'] = self.url
+        await super().connect()
+
+    async def list_tools(self, *args, **kwargs):
+        """Lists this agent's tools only, out of all the agents' tools on the shared server."""
+        tools = await super().list_tools(*args, **kwargs)
+        return [tool for tool in tools if tool.name in self._tool_names]
 
     async def _start(self, inputs) -> str:
         """Handles a simple start request for the agent.
@@ -189,8 +249,7 @@ class MCPAgent(MCPServerSse):
         Returns:
             str: A message indicating the job has started, along with the job ID.
         """
-        # Submit a job for this agent, no dependencies
-        job_id = await submit_job(self.job_queue, self.agent, str(inputs), self.strategy_name)
+        job_id = await start_agent(self, inputs)
         return f'Agent is running. Job started: {job_id}'
 
 
@@ -200,8 +259,8 @@ class MCPAgent(MCPServerSse):
         This method is exposed as an MCP tool: `_start_and_wait_{name}`.
         It submits a job for the current MCPAgent. Then, it modifies the job specified
         by `your_job_id` (the calling agent's job) to depend on the newly created job.
-        The calling agent's job status is set to 'in_queue' and it's put back on the
-        job queue to wait.
+        The calling agent's job status is set to 'in_queue'; once its current run returns,
+        the worker requeues it when the new job's `done_event` is set.
 
         Args:
             agent_inputs (str): The input/prompt for the job of this MCPAgent.
@@ -219,13 +278,12 @@ class MCPAgent(MCPServerSse):
         if not waiter:
             return f"Job {your_job_id} not found. You must provide your own job id to wait for another job."
         else:# change the waiter job status to in_queue 
-            waiter.status = 'in_queue'
+            set_job_status(waiter, 'in_queue')
             # add the job id to the waiter's depends_on
             waiter.depends_on.append(job_id)
             # add the job id to the waiter's chat_history
-            waiter.chat_history += f"Job {job_id} has been started.\n"
-            # put the waiter back in the job queue
-            await self.job_queue.put(waiter)
+            waiter.chat_history.append({"role": "system", "content": f"Job {job_id} has been started."})
+            # no enqueue here: the waiter's worker waits on the new job when this run returns
 
         return f"Job {job_id} has been started. To wait for it\'s completion return your plan."
 
@@ -245,28 +303,30 @@ class MCPAgent(MCPServerSse):
         }
 
     async def end_and_cleanup(self):
-        """Shuts down the MCPAgent's FastMCP server and cleans up SSE client resources.
+        """Cleans up the MCPAgent's SSE client resources.
 
         This method should be called during application shutdown to ensure graceful
-        termination of background tasks and network connections.
+        termination of network connections. The shared agents MCP server is stopped
+        by cancelling the task returned by `start_agent_mcp_server`.
         """
-        if self.mcp_task:
-            self.mcp_task.cancel()
-            await asyncio.gather(self.mcp_task, return_exceptions=True)
-        # cleanup SSE client
-        await asyncio.gather(self.cleanup())
+        # cleanup SSE client; forgotten so no job reuses the closed session
+        await cleanup_mcp_server(self)
 
-async def start_agent(mcp_agent: MCPAgent, inputs, strategy_name=None):
+async def start_agent(mcp_agent: MCPAgent, inputs, strategy_name=None) -> str:
     """Submits a job to the specified MCPAgent's job queue.
 
-    This is a utility function to trigger an agent run. It should be called
-    from an async context.
+    This is a utility function to trigger an agent run. It must be awaited from
+    within the running event loop (tool handlers, API endpoints); it only enqueues
+    the job and never blocks on the run itself.
 
     Args:
         mcp_agent (MCPAgent): The MCPAgent instance to run.
         inputs: The input prompt or data for the agent.
         strategy_name (str, optional): The name of the chat strategy to use.
             If None, uses the `mcp_agent.strategy_name` or defaults to "default".
+
+    Returns:
+        str: The ID of the submitted job.
     """
     # Submit a job for this agent, no dependencies
-    await submit_job(mcp_agent.job_queue, mcp_agent.agent, str(inputs), strategy_name or getattr(mcp_agent, 'strategy_name', 'default'))
+    return await submit_job(mcp_agent.job_queue, mcp_agent.agent, str(inputs), strategy_name or getattr(mcp_agent, 'strategy_name', 'default'))
@@ -10,16 +10,17 @@ file that matches *_mcp_server.py* inside a chosen directory.
 from __future__ import annotations
 from pathlib import Path
 import importlib.util
-import inspect
 import sys
-from typing import Dict, Type, Any, Tuple, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Tuple, List
 from agents.mcp import MCPServerStdio, MCPServerSse
 
 
 # ── CONFIG ────────────────────────────────────────────────────────────────
 SEARCH_DIR      = Path("mcp_servers")                # or Path("services")
 MODULE_SUFFIX   = "_mcp_server.py"
-TARGET_CLS: Type[Any] = MCPServerSse | MCPServerStdio      # import / define this first
+TARGET_CLS: Tuple[type, ...] = (MCPServerSse, MCPServerStdio)  # import / define this first
+IMPORT_WORKERS  = 8                                  # max server modules imported at once
 # ──────────────────────────────────────────────────────────────────────────
 
 def import_module_from_path(path: Path):
@@ -43,8 +44,9 @@ def collect_servers() -> Tuple[Dict[str, MCPServerSse | MCPServerStdio], List[An
     """Discovers and collects MCP server instances from specified modules.
 
     This function scans the `SEARCH_DIR` for Python files ending with `MODULE_SUFFIX`.
-    For each matching file, it:
-    1. Dynamically imports the module.
+    All matching files are imported first, concurrently on a thread pool (reading and
+    compiling them is mostly I/O). Then, in file order on the calling thread, it:
+    1. Takes the imported module.
     2. Inspects the module for top-level instances of `TARGET_CLS` (MCPServerSse or MCPServerStdio).
        These instances are collected into a dictionary keyed by their `name` attribute.
     3. If the module defines a callable `main()` function, it is executed. Any task returned
@@ -62,12 +64,20 @@ def collect_servers() -> Tuple[Dict[str, MCPServerSse | MCPServerStdio], List[An
     servers: Dict[str, MCPServerSse | MCPServerStdio] = {}
     tasks_list = []
 
-    for file in SEARCH_DIR.glob(f"*{MODULE_SUFFIX}"):
-        mod = import_module_from_path(file)
+    files = list(SEARCH_DIR.glob(f"*{MODULE_SUFFIX}"))
+    if not files:
+        return servers, tasks_list
+    with ThreadPoolExecutor(max_workers=min(IMPORT_WORKERS, len(files))) as pool:
+        modules = list(pool.map(import_module_from_path, files))
 
-        # 1️⃣ gather every top-level instance of TARGET_CLS
-        for _, obj in inspect.getmembers(mod, lambda x: isinstance(x, TARGET_CLS)):
-            servers[obj.name] = obj        # duplicates overwrite silently
+    # main() schedules tasks on the event loop, so it must run here rather than in the pool
+    for mod in modules:
+
+        # 1️⃣ gather every top-level instance of TARGET_CLS (straight from the module
+        # namespace; inspect.getmembers would getattr and sort every member)
+        for obj in mod.__dict__.values():
+            if isinstance(obj, TARGET_CLS):
+                servers[obj.name] = obj    # duplicates overwrite silently
 
         # 2️⃣ call `main()` if present and callable
         main = getattr(mod, "main", None)
@@ -19,7 +19,7 @@ import asyncio
 import logging
 from typing import Dict, List, TYPE_CHECKING
 from fastmcp import FastMCP
-from one_prompt_agents.job_manager import JOBS, get_job
+from one_prompt_agents.job_manager import JOBS, get_job, set_job_status
 from one_prompt_agents.utils import uvicorn_log_level
 
 if TYPE_CHECKING:
@@ -132,8 +132,9 @@ async def wait_for_jobs(your_job_id: str, job_ids_to_wait_for: List[str]) -> str
     """Makes the calling agent's job wait for a list of other jobs to complete.
 
     This is a system-level MCP tool. It finds the job specified by `your_job_id`,
-    appends the `job_ids_to_wait_for` to its `depends_on` list, sets its
-    status to 'in_queue', and puts it back on the job queue to wait.
+    appends the `job_ids_to_wait_for` to its `depends_on` list and sets its
+    status to 'in_queue'. Once the caller's current run returns, its worker waits
+    on those jobs' `done_event`s and then puts it back on the job queue.
 
     Args:
         your_job_id (str): The job ID of the agent that is calling this tool and needs to wait.
@@ -154,9 +155,8 @@ async def wait_for_jobs(your_job_id: str, job_ids_to_wait_for: List[str]) -> str
     # Add the new dependencies
     waiter.depends_on.extend(job_ids_to_wait_for)
     
-    # Reset status and requeue
-    waiter.status = 'in_queue'
-    waiter.chat_history += f"Now waiting for jobs: {', '.join(job_ids_to_wait_for)}.\n"
-    await JOB_QUEUE.put(waiter)
+    # Reset status; the worker requeues the job when its run returns and the jobs are done
+    set_job_status(waiter, 'in_queue')
+    waiter.chat_history.append({"role": "system", "content": f"Now waiting for jobs: {', '.join(job_ids_to_wait_for)}."})
 
     return f"Your job ({your_job_id}) is now in queue, waiting for jobs {', '.join(job_ids_to_wait_for)} to complete."
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""
+Shared Pydantic models for agents whose return type carries a plan.
+
+Agents following the plan-based chat strategies return a list of plan steps
+together with a completion percentage. Instead of redefining these models in
+every agent's `return_type.py`, import them from here so that a single class
+(and a single pydantic-core schema) is shared by every agent:
+
+    from one_prompt_agents.plan_types import PlanReturnType
+
+    class MyAgentResponse(PlanReturnType):
+        content: str
+"""
+from typing import List
+from pydantic import BaseModel, ConfigDict
+
+
+class Steps(BaseModel):
+    """A single step of an agent's plan."""
+    model_config = ConfigDict(defer_build=True)
+    plan_step: str
+    step_name: str
+    verified: bool
+    checked: bool
+
+
+class PlanReturnType(BaseModel):
+    """Base return type for agents that report their progress as a plan."""
+    model_config = ConfigDict(defer_build=True)
+    plan: List[Steps]
+    plan_completion_percentage: float
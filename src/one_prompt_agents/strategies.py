@@ -14,17 +14,23 @@ Includes:
 - `chat_strategy_map`: A registry for available strategies.
 - `get_chat_strategy`: Function to retrieve a strategy class by name.
 - `register_strategy`: Function to add new strategies to the map.
+- `get_output_type`: A return type as augmented by a strategy, cached per pair.
 
 Strategies are designed to be decoupled from direct job state access by receiving
 a `get_job_func` to query job details, avoiding circular dependencies.
 """
 import logging
+from functools import lru_cache
+from operator import attrgetter
 from typing import Tuple, Optional, Any, Type, List, Dict
 from pydantic import TypeAdapter, BaseModel, Field, create_model
 import json
 
 logger = logging.getLogger(__name__)
 
+# ensure_return_type guarantees every plan step has `checked`, so it can be read in C
+_checked = attrgetter("checked")
+
 # Forward declaration for type hinting JOBS if needed by strategies, though not directly used in this snippet
 # from .job_manager import JOBS # This would create a circular import if JOBS is defined in job_manager
 # Instead, strategies will receive job_id and use a get_job function provided from elsewhere (e.g., job_manager)
@@ -233,9 +239,9 @@ class ContinueLastUncheckedStrategy(ChatEndStrategy):
             return False, None
 
         plan = getattr(final_output, 'plan', []) # Ensure plan is accessed safely
-        if len(plan) == 0:
+        if not plan:
             return False, "Plan shouldn't be empty. Revisit the conversation history and generate a new plan according to your goals."
-        elif all(getattr(step, 'checked', False) for step in plan): # Safe access to step.checked
+        elif all(map(_checked, plan)):
             return True, None
         else:
             return False, "Continue with the first step of the plan that is not checked yet. And after verifing the step goal mark it as checked."
@@ -305,9 +311,11 @@ class PlanWatcherStrategy(ChatEndStrategy):
         return NewReturn
 
     def __init__(self):
-        """Initializes the PlanWatcherStrategy with an empty plan dictionary."""
+        """Initializes the PlanWatcherStrategy with no known plan steps."""
         super().__init__()
-        self.plan_dict = {}  # step_name -> step data
+        # Names of the steps that were still unchecked in the previous plan, in plan order.
+        # Checked steps may disappear freely, so they are not tracked.
+        self._unchecked: Dict[str, None] = {}
 
     def next_turn(self, final_output, history, agent, job_id: str, get_job_func) -> Tuple[bool, Optional[str]]:
         """Monitors plan changes and determines the next course of action.
@@ -328,20 +336,30 @@ class PlanWatcherStrategy(ChatEndStrategy):
             return False, None
 
         plan = getattr(final_output, 'plan', [])
-        new_plan_dict = {getattr(step, 'step_name', str(i)): step for i, step in enumerate(plan)}
-        messages = []
-
-        for step_name, old_step in self.plan_dict.items():
-            if step_name not in new_plan_dict:
-                if not getattr(old_step, 'checked', False):
-                    messages.append(f"The step: {step_name} was unexpectedly removed from your plan, please review it and add it again properly.")
-
-        self.plan_dict = new_plan_dict.copy()
-
-        if len(plan) == 0:
+        names = []
+        unchecked: Dict[str, None] = {}
+        unchecked_steps = 0
+        for i, step in enumerate(plan):
+            step_name = getattr(step, 'step_name', str(i))
+            names.append(step_name)
+            if getattr(step, 'checked', False):
+                unchecked.pop(step_name, None)  # the last step with a given name wins
+            else:
+                unchecked[step_name] = None
+                unchecked_steps += 1
+        # One set difference finds the removed steps; the plan is only walked again to
+        # report them in plan order when there are any
+        removed = self._unchecked.keys() - frozenset(names)
+        messages = [
+            f"The step: {step_name} was unexpectedly removed from your plan, please review it and add it again properly."
+            for step_name in self._unchecked if step_name in removed
+        ] if removed else []
+        self._unchecked = unchecked
+
+        if not plan:
             messages.append("Plan shouldn't be empty. Revisit the conversation history and generate a new plan according to your goals.")
             return False, " ".join(messages)
-        elif all(getattr(step, 'checked', False) for step in plan):
+        elif not unchecked_steps:
             return True, None
         else:
             if not messages:
@@ -360,13 +378,18 @@ def register_strategy(name: str, strategy_class: type[ChatEndStrategy]):
     if name in chat_strategy_map:
         logger.warning(f"Strategy '{name}' is already registered. Overwriting.")
     chat_strategy_map[name] = strategy_class
+    get_chat_strategy.cache_clear()
+    get_output_type.cache_clear()
     logger.info(f"Chat strategy '{name}' registered.")
 
+@lru_cache(maxsize=None)
 def get_chat_strategy(strategy_name: str) -> type[ChatEndStrategy]:
     """Retrieves a chat strategy class based on its name.
 
     Looks up the strategy in the `chat_strategy_map`. If the name is not found,
-    it defaults to `ContinueLastUncheckedStrategy`.
+    it defaults to `ContinueLastUncheckedStrategy`. Results are cached per name
+    (so an unknown name is only warned about once); `register_strategy` clears
+    the cache, so register strategies through it rather than editing the map.
 
     Args:
         strategy_name (str): The name of the desired chat strategy.
@@ -378,4 +401,14 @@ def get_chat_strategy(strategy_name: str) -> type[ChatEndStrategy]:
     if not strategy_cls:
         logger.warning(f"Chat strategy '{strategy_name}' not found. Falling back to 'default' strategy.")
         return chat_strategy_map["default"]
-    return strategy_cls 
\ No newline at end of file
+    return strategy_cls 
+
+@lru_cache(maxsize=None)
+def get_output_type(strategy_name: str, return_type: Type[BaseModel]) -> Type[BaseModel]:
+    """Returns `return_type` as augmented by the named strategy, building each model class once.
+
+    Agents that share a return type and strategy get the same output class, so pydantic
+    builds its validator and JSON schema once rather than once per agent. Cleared by
+    `register_strategy`, like `get_chat_strategy`.
+    """
+    return get_chat_strategy(strategy_name).ensure_return_type(return_type)
@@ -0,0 +1,70 @@
+import asyncio
+import contextlib
+
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("agents")
+pytest.importorskip("fastmcp")
+pytest.importorskip("uvicorn")
+
+from pydantic import BaseModel
+
+from one_prompt_agents import mcp_agent
+from one_prompt_agents.mcp_agent import MCPAgent, start_agent_mcp_server
+
+
+class ProbeReturn(BaseModel):
+    content: str
+
+
+async def _connect(agent: MCPAgent, attempts: int = 50):
+    for _ in range(attempts):
+        try:
+            await agent.connect()
+            return
+        except Exception:
+            await asyncio.sleep(0.1)
+    await agent.connect()
+
+
+def _make_agent(name: str, prompt_file) -> MCPAgent:
+    return MCPAgent(
+        name=name,
+        prompt_file=str(prompt_file),
+        return_type=ProbeReturn,
+        inputs_description=f"{name} test agent",
+        mcp_servers=[],
+        job_queue=asyncio.Queue(),
+        model="gpt-4o-mini",
+    )
+
+
+def test_agent_lists_only_its_own_tools(tmp_path, monkeypatch):
+    monkeypatch.delenv("AGENT_MCP_PORT", raising=False)
+    prompt_file = tmp_path / "prompt.md"
+    prompt_file.write_text("You are a test agent.")
+
+    async def scenario():
+        probe = _make_agent("server_probe", prompt_file)
+        _make_agent("server_bystander", prompt_file)
+        task = start_agent_mcp_server()
+        try:
+            assert probe.url.startswith(f"http://{mcp_agent.AGENT_MCP_HOST}:")
+            assert not probe.url.endswith(":0/sse")
+            await _connect(probe)
+            try:
+                tools = await probe.list_tools()
+            finally:
+                await probe.cleanup()
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        return {tool.name for tool in tools}
+
+    assert asyncio.run(scenario()) == {
+        "start_agent_server_probe",
+        "_start_and_wait_server_probe",
+        "get_agent_info_server_probe",
+    }
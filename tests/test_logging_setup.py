@@ -0,0 +1,38 @@
+import io
+import logging
+
+import pytest
+
+pytest.importorskip("requests")  # imported by the package's __init__
+
+from one_prompt_agents.logging_setup import StreamToLogger
+
+
+class _Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_stream_follows_logger_level_changes():
+    logger = logging.getLogger("tests.stream_to_logger")
+    logger.propagate = False
+    handler = _Records()
+    logger.addHandler(handler)
+    logger.setLevel(logging.WARNING)
+    try:
+        console = io.StringIO()
+        stream = StreamToLogger(console, logger, logging.INFO)
+
+        stream.write("dropped\n")
+        logger.setLevel(logging.INFO)
+        stream.write("kept\n")
+
+        assert handler.messages == ["kept"]
+        assert console.getvalue() == "dropped\nkept\n"
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(logging.NOTSET)
@@ -0,0 +1,52 @@
+"""Tests for reusing the cached plan of an identical, completed job."""
+import pytest
+
+pytest.importorskip("pydantic")
+
+from one_prompt_agents.job_manager import (
+    JOBS, PLAN_CACHE, Job, add_job, cache_plan, get_cached_plan, get_job, job_fingerprint,
+)
+from one_prompt_agents.plan_types import PlanReturnType
+from one_prompt_agents.strategies import ContinueLastUncheckedStrategy, PlanWatcherStrategy
+
+
+def _completed_plan():
+    return [
+        {"plan_step": "Fetch the data", "step_name": "fetch", "verified": True, "checked": True},
+        {"plan_step": "Write the report", "step_name": "report", "verified": True, "checked": True},
+    ]
+
+
+def test_cached_plan_comes_back_unchecked():
+    fingerprint = job_fingerprint("ReportAgent", "default", "weekly report", "prompt v1")
+    cache_plan(fingerprint, _completed_plan())
+
+    hydrated = get_cached_plan(fingerprint)
+
+    assert [step["step_name"] for step in hydrated] == ["fetch", "report"]
+    assert not any(step["checked"] for step in hydrated)
+    # The cached copy itself is left untouched
+    assert all(step["checked"] for step in PLAN_CACHE[fingerprint])
+
+
+@pytest.mark.parametrize("strategy_cls", [ContinueLastUncheckedStrategy, PlanWatcherStrategy])
+def test_cached_completed_plan_does_not_end_the_job(strategy_cls):
+    fingerprint = job_fingerprint("ReportAgent", strategy_cls.__name__, "weekly report", "prompt v1")
+    cache_plan(fingerprint, _completed_plan())
+    job = Job(job_id=f"job-{strategy_cls.__name__}", agent=None, text="weekly report",
+              strategy_name=strategy_cls.__name__, status="in_progress", fingerprint=fingerprint)
+    add_job(job)
+    try:
+        # First turn of the new job: the agent echoes the hydrated plan back unchanged
+        output = PlanReturnType(plan=get_cached_plan(fingerprint), plan_completion_percentage=0.0)
+        end_run, next_message = strategy_cls().next_turn(output, [], None, job.job_id, get_job)
+    finally:
+        JOBS.pop(job.job_id, None)
+
+    assert not end_run
+    assert next_message
+
+
+def test_fingerprint_changes_with_the_agent_instructions():
+    assert job_fingerprint("ReportAgent", "default", "weekly report", "prompt v1") != \
+        job_fingerprint("ReportAgent", "default", "weekly report", "prompt v2")
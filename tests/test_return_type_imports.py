@@ -0,0 +1,36 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("agents")
+pytest.importorskip("fastmcp")
+
+from one_prompt_agents.agents_loader import import_module_from_path
+
+
+def test_return_type_modules_get_distinct_names(tmp_path):
+    files = []
+    for name in ("alpha", "beta", "gamma", "delta"):
+        folder = tmp_path / name
+        folder.mkdir()
+        path = folder / "return_type.py"
+        path.write_text(f"AGENT = {name!r}\n")
+        files.append(path)
+    had_bare_stem = "return_type" in sys.modules
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        modules = list(pool.map(import_module_from_path, files))
+
+    assert [m.AGENT for m in modules] == ["alpha", "beta", "gamma", "delta"]
+    assert len({m.__name__ for m in modules}) == len(modules)
+    for module in modules:
+        assert sys.modules[module.__name__] is module
+    assert ("return_type" in sys.modules) == had_bare_stem
+
+
+def test_cache_hit_returns_the_same_module(tmp_path):
+    path = tmp_path / "return_type.py"
+    path.write_text("AGENT = 'solo'\n")
+    assert import_module_from_path(path) is import_module_from_path(path)